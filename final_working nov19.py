@@ -1,11 +1,23 @@
 import sys
+import os
 import numpy as np
 import math
 import csv
+import bisect
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from time import perf_counter
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
 import matplotlib.pyplot as plt
 import mplcursors
 from scipy.stats import chi2
+from scipy.special import logsumexp
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 from PyQt5.QtWidgets import (QApplication, QWidget, QTableWidget, QVBoxLayout, QPushButton, QFileDialog, QLabel, QComboBox, QTextEdit,
                              QHBoxLayout, QSplitter, QCheckBox, QLineEdit, QDialog, QGridLayout, QGroupBox, QRadioButton,
                              QFrame, QSizePolicy, QToolButton, QTabWidget, QMenu, QAction, QTableWidgetItem, QScrollArea)
@@ -20,12 +32,18 @@ import pyqtgraph as pg
 
 # Custom stream class to redirect stdout
 # Custom stream class to redirect stdout
-class OutputStream:
+class OutputStream(QObject):
+    # sys.stdout for the GUI. Text goes to the console widget through a signal, so prints from other threads
+    # (pipeline stages, the cluster pool) are queued to the GUI thread instead of touching the widget directly
+    text_written = pyqtSignal(str)
+
     def __init__(self, text_edit):
+        super().__init__()
         self.text_edit = text_edit
+        self.text_written.connect(text_edit.append)
 
     def write(self, text):
-        self.text_edit.append(text)
+        self.text_written.emit(text)
 
     def flush(self): 
         pass  # No need to implement flush for QTextEdit
@@ -50,6 +68,89 @@ class CVFilter:
         self.first_rep_flag = False
         self.second_rep_flag = False
         self.gate_threshold = 900.21  # 95% confidence interval for Chi-squared distribution with 3 degrees of freedom
+        # Doppler (range-rate) measurement model
+        self.doppler_sigma = 1.0  # Range-rate noise standard deviation (m/s)
+        self.doppler_gate_threshold = self.gate_threshold + chi2.ppf(0.95, 1)  # Position gate plus one doppler degree of freedom
+        self.doppler_gate_sigma = 5.0  # Doppler spread allowed for tracks without a velocity estimate (m/s)
+        # Converted-measurement noise from the radar's polar accuracies (optional, replaces the fixed R)
+        self.polar_noise = False
+        self.range_sigma = 1.0  # Range noise standard deviation (m)
+        self.azimuth_sigma = 0.003  # Azimuth noise standard deviation (deg)
+        self.elevation_sigma = 0.003  # Elevation noise standard deviation (deg)
+        # Steady-state gain fast path (optional)
+        self.steady_state_gain = False  # Reuse a cached gain/covariance once the track has converged
+        self.steady_state_tol = 1e-4  # Relative gain change treated as converged
+        self.steady_state_scans = 3  # Consecutive converged scans needed before caching
+        self.steady_state_cache = {}  # dt -> (K, Pp, Pf)
+        self.converged_count = 0
+        self.converged = False
+        self.last_K = None
+        self.last_dt = None
+        self.dt = None
+        self.awaiting_update = False  # Set by predict, cleared by update; still set at next predict means a miss
+        self.use_cached_gain = False
+        self.dtype = np.dtype(np.float64)
+        # Out-of-sequence measurement buffer: (time, Z, state snapshot before that update)
+        self.oosm_buffer_length = 10
+        self.oosm_buffer = deque(maxlen=self.oosm_buffer_length)
+        self.replayed = []  # (time, Sf, Pf, Sp, Pp) after each update redone by the last out-of-sequence replay
+
+    # Attributes needed to rewind the filter to an earlier step
+    snapshot_attrs = ('Sf', 'Pf', 'prev_Time', 'Meas_Time')
+
+    def snapshot(self):
+        return {name: np.copy(getattr(self, name)) for name in self.snapshot_attrs}
+
+    def restore(self, snapshot):
+        for name, value in snapshot.items():
+            setattr(self, name, np.copy(value) if isinstance(value, np.ndarray) and value.ndim else value.item())
+        # The rewound state is no longer on the cached steady-state trajectory
+        self.converged = False
+        self.converged_count = 0
+        self.awaiting_update = False
+
+    def process_measurement(self, Z, time, R=None):
+        # Predict + update, applying late reports by replay from the buffer.
+        # R is the report's own noise covariance (None uses the filter's fixed R); Z = None coasts.
+        # Returns True when the report was in sequence.
+        if time >= self.prev_Time:
+            if Z is None:
+                self.coast_filters([self], time)
+                return True
+            self.oosm_buffer.append((time, Z, R, self.snapshot()))
+            self.predict_step(time)
+            self.update_step(Z, R)
+            return True
+        self.apply_out_of_sequence(Z, time, R)
+        return False
+
+    def apply_out_of_sequence(self, Z, time, R=None):
+        entries = list(self.oosm_buffer)
+        later = [i for i, entry in enumerate(entries) if entry[0] > time]
+        self.replayed = []
+        if not later or entries[later[0]][3]['prev_Time'] > time:
+            print(f"Out-of-sequence report at time {time} is older than the retrodiction buffer, dropped")
+            return
+        first = later[0]
+        print(f"Out-of-sequence report at time {time}: replaying {len(entries) - first} buffered updates")
+        # Rewind to the state just before the first later update, then replay in time order
+        self.restore(entries[first][3])
+        self.oosm_buffer = deque(entries[:first], maxlen=self.oosm_buffer_length)
+        self.process_measurement(Z, time, R)
+        self.replayed.append((time, self.Sf.copy(), self.Pf.copy(), self.Sp.copy(), self.Pp.copy()))
+        for entry_time, entry_Z, entry_R, _ in entries[first:]:
+            self.process_measurement(entry_Z, entry_time, entry_R)
+            if entry_Z is not None:
+                self.replayed.append((entry_time, self.Sf.copy(), self.Pf.copy(), self.Sp.copy(), self.Pp.copy()))
+
+    def set_dtype(self, dtype):
+        # Cast states, covariances and model matrices to the filter-bank precision
+        self.dtype = np.dtype(dtype)
+        for name, value in list(vars(self).items()):
+            if isinstance(value, np.ndarray) and value.dtype.kind == 'f':
+                setattr(self, name, value.astype(self.dtype))
+        for model in getattr(self, 'models', []):
+            model.set_dtype(dtype)
 
     def initialize_filter_state(self, x, y, z, vx, vy, vz, time):
         print(f"Initializing filter state with x: {x}, y: {y}, z: {z}, vx: {vx}, vy: {vy}, vz: {vz}, time: {time}")
@@ -79,6 +180,23 @@ class CVFilter:
     def predict_step(self, current_time):
         dt = current_time - self.prev_Time
         print(f"Predict step with dt: {dt}")
+        dt_key = round(dt, 6)
+        if self.awaiting_update or dt_key != self.last_dt:
+            # Missed scan or revisit interval changed: leave steady state and rebuild convergence
+            self.converged = False
+            self.converged_count = 0
+        self.dt = dt_key
+        self.awaiting_update = True
+        self.use_cached_gain = self.steady_state_gain and self.converged and dt_key in self.steady_state_cache
+        if self.use_cached_gain:
+            self.Phi[0, 3] = dt
+            self.Phi[1, 4] = dt
+            self.Phi[2, 5] = dt
+            self.Sp = np.dot(self.Phi, self.Sf)
+            self.Pp = self.steady_state_cache[dt_key][1]
+            self.Meas_Time = current_time
+            self.prev_Time = current_time
+            return
         T_2 = (dt * dt) / 2.0
         T_3 = (dt * dt * dt) / 3.0
         self.Phi[0, 3] = dt
@@ -100,18 +218,521 @@ class CVFilter:
         self.Sp = np.dot(self.Phi, self.Sf)
         self.Pp = np.dot(np.dot(self.Phi, self.Pf), self.Phi.T) + self.Q
         self.Meas_Time = current_time
+        self.prev_Time = current_time
 
-    def update_step(self, Z):
+    def update_step(self, Z, R=None):
         print(f"Update step with measurement Z: {Z}")
+        Z = np.asarray(Z, dtype=self.dtype)
+        self.awaiting_update = False
+        if Z.shape[0] == 4 or R is not None:
+            # Range rate is nonlinear and a per-report R moves the gain every scan:
+            # full update through the batched kernel, no steady-state reuse
+            Sf, Pf, _, _ = self.update_batch(self.Sp[np.newaxis], self.Pp[np.newaxis], Z[np.newaxis],
+                                             None if R is None else np.asarray(R)[np.newaxis])
+            self.Sf, self.Pf = Sf[0], Pf[0]
+            self.converged = False
+            self.converged_count = 0
+            return
+        if self.use_cached_gain:
+            K, _, Pf = self.steady_state_cache[self.dt]
+            self.Sf = self.Sp + np.dot(K, Z - np.dot(self.H, self.Sp))
+            self.Pf = Pf
+            return
         Inn = Z - np.dot(self.H, self.Sp)
         S = np.dot(self.H, np.dot(self.Pp, self.H.T)) + self.R
         K = np.dot(np.dot(self.Pp, self.H.T), np.linalg.inv(S))
         self.Sf = self.Sp + np.dot(K, Inn)
-        self.Pf = np.dot(np.eye(6) - np.dot(K, self.H), self.Pp)
+        # Joseph form: stays symmetric positive semi-definite in float32, where (I - KH) Pp does not
+        I_KH = np.eye(6, dtype=self.dtype) - np.dot(K, self.H)
+        Pf = np.dot(np.dot(I_KH, self.Pp), I_KH.T) + np.dot(np.dot(K, self.R), K.T)
+        self.Pf = 0.5 * (Pf + Pf.T)
+        if self.steady_state_gain:
+            self.check_steady_state(K)
+
+    def check_steady_state(self, K):
+        # Count consecutive scans at the same dt whose gain barely moved; cache the fixed point once converged
+        if self.last_K is not None and self.dt == self.last_dt and \
+                np.linalg.norm(K - self.last_K) <= self.steady_state_tol * np.linalg.norm(K):
+            self.converged_count += 1
+        else:
+            self.converged_count = 0
+        self.last_K = K
+        self.last_dt = self.dt
+        if self.converged_count >= self.steady_state_scans:
+            self.steady_state_cache[self.dt] = (K.copy(), self.Pp.copy(), self.Pf.copy())
+            self.converged = True
+
+    def transition_matrices(self, dt, Sf=None):
+        # Stacked Phi and Q for an array of time steps, shape (N, 6, 6); Sf is only used by nonlinear models
+        dt = np.atleast_1d(np.asarray(dt, dtype=float))
+        n = dt.shape[0]
+        idx = np.arange(3)
+        Phi = np.tile(np.eye(6), (n, 1, 1))
+        Phi[:, idx, idx + 3] = dt[:, None]
+        Q = np.zeros((n, 6, 6))
+        Q[:, idx, idx] = (dt ** 3 / 3.0)[:, None]
+        Q[:, idx, idx + 3] = (dt ** 2 / 2.0)[:, None]
+        Q[:, idx + 3, idx] = (dt ** 2 / 2.0)[:, None]
+        Q[:, idx + 3, idx + 3] = dt[:, None]
+        return Phi, Q * self.plant_noise
+
+    def predict_batch(self, Sf, Pf, dt):
+        # Predict a stack of tracks at once: Sf (N, n, 1), Pf (N, n, n), dt scalar or (N,)
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (Sf.shape[0],))
+        Phi, Q = self.transition_matrices(dt)
+        Phi, Q = Phi.astype(Sf.dtype, copy=False), Q.astype(Sf.dtype, copy=False)
+        Sp = Phi @ Sf
+        Pp = Phi @ Pf @ np.swapaxes(Phi, -1, -2) + Q
+        return Sp, Pp
+
+    def measurement_model(self, Sp, m, R=None):
+        # Predicted measurement, Jacobian and noise for stacked states (N, n, 1).
+        # m = 3 is position only; m = 4 appends range rate (p . v) / |p|.
+        # R overrides the filter noise with per-report covariances (N, m, m).
+        if m == 3:
+            return self.H @ Sp, np.broadcast_to(self.H, (Sp.shape[0],) + self.H.shape), self.R if R is None else R
+        p = Sp[:, 0:3, 0]
+        v = Sp[:, 3:6, 0]
+        r = np.maximum(np.linalg.norm(p, axis=1), 1e-6)
+        rdot = np.sum(p * v, axis=1) / r
+        H = np.zeros((Sp.shape[0], 4, Sp.shape[-2]), dtype=Sp.dtype)
+        H[:, :3, :3] = np.eye(3)
+        H[:, 3, 0:3] = v / r[:, None] - (rdot / r ** 2)[:, None] * p
+        H[:, 3, 3:6] = p / r[:, None]
+        if R is None:
+            R = np.zeros((4, 4), dtype=Sp.dtype)
+            R[:3, :3] = self.R
+            R[3, 3] = self.doppler_sigma ** 2
+        z_pred = np.concatenate([p, rdot[:, None]], axis=1)[:, :, np.newaxis]
+        return z_pred, H, R
+
+    def measurement_covariances(self, measurements, use_doppler=False):
+        # Noise covariance of every report in a scan, shape (N, m, m): converted from the
+        # polar sigmas when polar_noise is set, otherwise the fixed R
+        measurements = np.asarray([m[:3] for m in measurements], dtype=float)
+        if self.polar_noise:
+            R3 = converted_measurement_covariance(measurements, self.range_sigma, self.azimuth_sigma,
+                                                  self.elevation_sigma)
+        else:
+            R3 = np.broadcast_to(self.R, (measurements.shape[0], 3, 3))
+        if not use_doppler:
+            return R3.astype(self.dtype)
+        R = np.zeros((measurements.shape[0], 4, 4), dtype=self.dtype)
+        R[:, :3, :3] = R3
+        R[:, 3, 3] = self.doppler_sigma ** 2
+        return R
+
+    def update_batch(self, Sp, Pp, Z, R=None):
+        # Update a stack of tracks at once with Z (N, 3, 1), or (N, 4, 1) with range rate;
+        # returns innovation and S for gating/likelihoods
+        Z = np.asarray(Z).astype(Sp.dtype, copy=False)
+        if R is not None:
+            R = np.asarray(R).astype(Sp.dtype, copy=False)
+        z_pred, H, R = self.measurement_model(Sp, Z.shape[-2], R)
+        Inn = Z - z_pred
+        S = H @ Pp @ np.swapaxes(H, -1, -2) + R
+        K = np.swapaxes(np.linalg.solve(S, H @ Pp), -1, -2)  # Pp H^T S^-1 without forming the inverse
+        Sf = Sp + K @ Inn
+        # Joseph form, symmetrised: the plain (I - KH) Pp loses definiteness in float32
+        I_KH = np.eye(Sp.shape[-2], dtype=Sp.dtype) - K @ H
+        Pf = I_KH @ Pp @ np.swapaxes(I_KH, -1, -2) + K @ R @ np.swapaxes(K, -1, -2)
+        Pf = 0.5 * (Pf + np.swapaxes(Pf, -1, -2))
+        return Sf, Pf, Inn, S
+
+    def prediction_source(self, time):
+        # The state a report at time is predicted from. A late report uses the buffered state that
+        # out-of-sequence replay will rewind to, so gating sees the same prediction the update does.
+        if time >= self.prev_Time:
+            return {name: getattr(self, name) for name in self.snapshot_attrs}
+        for entry_time, _, _, snapshot in self.oosm_buffer:
+            if entry_time > time:
+                if snapshot['prev_Time'] <= time:
+                    return snapshot
+                break
+        # Older than the buffer: hold the current state rather than predict it backwards
+        source = {name: getattr(self, name) for name in self.snapshot_attrs}
+        source['prev_Time'] = time
+        return source
+
+    def predict_filters(self, filters, time):
+        # Predict many filters of this type to time (scalar or one per filter) in one batch, without touching them
+        times = np.broadcast_to(np.asarray(time, dtype=float), (len(filters),))
+        _, Sp, Pp = self.predict_snapshots([f.prediction_source(t) for f, t in zip(filters, times)], times)
+        return Sp, Pp
+
+    def seed_filters(self, filters, states, covs, times):
+        # Write initiation estimates of position and velocity (N, 6) with covariances (N, 6, 6) into
+        # a batch of filters of this type; higher-order states keep their initial uncertainty
+        for f, state, cov, time in zip(filters, states, covs, times):
+            Sf = np.zeros_like(f.Sf)
+            Sf[:6, 0] = state
+            Pf = f.Pf.copy()
+            Pf[:6, :] = 0.0
+            Pf[:, :6] = 0.0
+            Pf[:6, :6] = cov
+            f.Sf, f.Pf = Sf, Pf
+            f.Sp, f.Pp = Sf.copy(), Pf.copy()
+            f.prev_Time = f.Meas_Time = time
+            f.first_rep_flag = True
+            f.second_rep_flag = True
+
+    def coast_filters(self, filters, time):
+        # Predict-only step for filters of this type that missed a scan, batched, to time (scalar or one per
+        # filter); the coast is buffered like an update so out-of-sequence replay reproduces it
+        times = np.broadcast_to(np.asarray(time, dtype=float), (len(filters),))
+        Sp, Pp = self.predict_filters(filters, times)
+        for f, t, sp, pp in zip(filters, times, Sp, Pp):
+            f.oosm_buffer.append((t, None, None, f.snapshot()))
+            f.Sp, f.Pp = sp, pp
+            f.Sf, f.Pf = sp.copy(), pp.copy()
+            f.prev_Time = f.Meas_Time = t
+            f.converged = False  # A missed scan leaves the steady-state trajectory
+            f.converged_count = 0
+            f.awaiting_update = False
+
+    def predict_snapshots(self, snapshots, time):
+        # Batched prediction of filter snapshots (e.g. MHT hypotheses) to time.
+        # Returns the raw prediction for update_snapshots and the output state/covariance (N, n, 1), (N, n, n).
+        Sf = np.stack([s['Sf'] for s in snapshots])
+        Pf = np.stack([s['Pf'] for s in snapshots])
+        # time is scalar or one per snapshot; never predict backwards
+        dt = np.maximum(np.asarray(time, dtype=float) - np.array([s['prev_Time'] for s in snapshots], dtype=float), 0.0)
+        Sp, Pp = self.predict_batch(Sf, Pf, dt)
+        return (Sp, Pp), Sp, Pp
+
+    def update_snapshots(self, prediction, index, Z, R, time):
+        # New snapshots from rows index of a predict_snapshots result, updated with Z (N, m, 1) and R (N, m, m);
+        # Z = None keeps the prediction (a missed detection)
+        Sp, Pp = (a[index] for a in prediction)
+        Sf, Pf = (Sp, Pp) if Z is None else self.update_batch(Sp, Pp, Z, R)[:2]
+        return [{'Sf': sf, 'Pf': pf, 'Sp': sp, 'Pp': pp, 'prev_Time': np.float64(time), 'Meas_Time': np.float64(time)}
+                for sf, pf, sp, pp in zip(Sf, Pf, Sp, Pp)]
+
+    def peek_prediction(self, time):
+        # Predicted state and covariance at time without touching the filter
+        _, Sp, Pp = self.predict_snapshots([self.prediction_source(time)], time)
+        return Sp[0], Pp[0]
+
+    def innovation_distance(self, Z, time, R=None):
+        # Squared Mahalanobis distance of Z (3 or 4 rows) from the prediction at time
+        Sp, Pp = self.peek_prediction(time)
+        Z = np.asarray(Z, dtype=Sp.dtype).reshape(1, -1, 1)
+        z_pred, H, R = self.measurement_model(Sp[np.newaxis], Z.shape[-2], None if R is None else np.asarray(R)[np.newaxis])
+        Inn = Z - z_pred
+        S = H @ Pp @ np.swapaxes(H, -1, -2) + R
+        return float((np.swapaxes(Inn, -1, -2) @ np.linalg.solve(S, Inn))[0, 0, 0])
+
+
+class CAFilter(CVFilter):
+    # Constant-acceleration filter, state [x, y, z, vx, vy, vz, ax, ay, az].
+    # All arithmetic goes through the stacked predict_batch/update_batch kernels;
+    # the single-track methods below are the N=1 case of the same code.
+    def __init__(self):
+        super().__init__()
+        self.Sf = np.zeros((9, 1))
+        self.Pf = np.eye(9)
+        self.Sp = np.zeros((9, 1))
+        self.Pp = np.eye(9)
+        self.plant_noise = 20  # Jerk noise intensity
+        self.H = np.eye(3, 9)
+        self.Q = np.eye(9)
+        self.Phi = np.eye(9)
+
+    def transition_matrices(self, dt, Sf=None):
+        # Stacked Phi and Q (white-noise jerk model) for an array of time steps, shape (N, 9, 9)
+        dt = np.atleast_1d(np.asarray(dt, dtype=float))
+        n = dt.shape[0]
+        idx = np.arange(3)
+        Phi = np.tile(np.eye(9), (n, 1, 1))
+        Phi[:, idx, idx + 3] = dt[:, None]
+        Phi[:, idx, idx + 6] = (dt ** 2 / 2.0)[:, None]
+        Phi[:, idx + 3, idx + 6] = dt[:, None]
+
+        # Per-axis 3x3 block over (position, velocity, acceleration)
+        block = np.empty((n, 3, 3))
+        block[:, 0, 0] = dt ** 5 / 20.0
+        block[:, 0, 1] = block[:, 1, 0] = dt ** 4 / 8.0
+        block[:, 0, 2] = block[:, 2, 0] = dt ** 3 / 6.0
+        block[:, 1, 1] = dt ** 3 / 3.0
+        block[:, 1, 2] = block[:, 2, 1] = dt ** 2 / 2.0
+        block[:, 2, 2] = dt
+        Q = np.zeros((n, 9, 9))
+        for i in range(3):
+            for j in range(3):
+                Q[:, idx + 3 * i, idx + 3 * j] = block[:, i, j][:, None]
+        return Phi, Q * self.plant_noise
+
+    def predict_step(self, current_time):
+        dt = current_time - self.prev_Time
+        print(f"Predict step with dt: {dt}")
+        Phi, Q = self.transition_matrices(dt)
+        self.Phi, self.Q = Phi[0], Q[0]
+        Sp, Pp = self.predict_batch(self.Sf[np.newaxis], self.Pf[np.newaxis], dt)
+        self.Sp, self.Pp = Sp[0], Pp[0]
+        self.Meas_Time = current_time
+        self.prev_Time = current_time
+
+    def update_step(self, Z, R=None):
+        print(f"Update step with measurement Z: {Z}")
+        Sf, Pf, _, _ = self.update_batch(self.Sp[np.newaxis], self.Pp[np.newaxis], np.asarray(Z, dtype=float).reshape(1, -1, 1),
+                                         None if R is None else np.asarray(R)[np.newaxis])
+        self.Sf, self.Pf = Sf[0], Pf[0]
+
+
+class CTFilter(CAFilter):
+    # Coordinated-turn EKF, state [x, y, z, vx, vy, vz, omega] with the turn in the
+    # x-y plane and constant velocity in z. Jacobians, predict and update are
+    # evaluated for the whole stack of tracks in one pass.
+    def __init__(self):
+        CVFilter.__init__(self)
+        self.Sf = np.zeros((7, 1))
+        self.Pf = np.eye(7)
+        self.Pf[6, 6] = np.deg2rad(5.0) ** 2  # Initial turn-rate uncertainty
+        self.Sp = np.zeros((7, 1))
+        self.Pp = np.eye(7)
+        self.plant_noise = 20  # Acceleration noise intensity
+        self.turn_rate_noise = np.deg2rad(1.0) ** 2  # Turn-rate noise intensity (rad^2/s^3)
+        self.H = np.eye(3, 7)
+        self.Q = np.eye(7)
+        self.Phi = np.eye(7)
+
+    def _turn_terms(self, w, dt):
+        # sin(wT)/w, (1-cos(wT))/w and their derivatives w.r.t. w, with series limits near w = 0
+        wt = w * dt
+        small = np.abs(w) < 1e-6
+        w_safe = np.where(small, 1.0, w)
+        s, c = np.sin(wt), np.cos(wt)
+        A = np.where(small, dt, s / w_safe)
+        B = np.where(small, w * dt ** 2 / 2.0, (1.0 - c) / w_safe)
+        dA = np.where(small, -w * dt ** 3 / 3.0, (dt * c * w - s) / w_safe ** 2)
+        dB = np.where(small, dt ** 2 / 2.0, (dt * s * w - (1.0 - c)) / w_safe ** 2)
+        return s, c, A, B, dA, dB
+
+    def transition_matrices(self, dt, Sf=None):
+        # Stacked Jacobian F and Q for an array of time steps, evaluated at Sf (N, 7, 1)
+        dt = np.atleast_1d(np.asarray(dt, dtype=float))
+        n = dt.shape[0]
+        if Sf is None:
+            Sf = np.zeros((n, 7, 1))
+        vx, vy, w = Sf[:, 3, 0], Sf[:, 4, 0], Sf[:, 6, 0]
+        s, c, A, B, dA, dB = self._turn_terms(w, dt)
+
+        F = np.tile(np.eye(7), (n, 1, 1))
+        F[:, 0, 3] = A
+        F[:, 0, 4] = -B
+        F[:, 0, 6] = dA * vx - dB * vy
+        F[:, 1, 3] = B
+        F[:, 1, 4] = A
+        F[:, 1, 6] = dB * vx + dA * vy
+        F[:, 2, 5] = dt
+        F[:, 3, 3] = c
+        F[:, 3, 4] = -s
+        F[:, 3, 6] = -dt * (s * vx + c * vy)
+        F[:, 4, 3] = s
+        F[:, 4, 4] = c
+        F[:, 4, 6] = dt * (c * vx - s * vy)
+
+        idx = np.arange(3)
+        Q = np.zeros((n, 7, 7))
+        Q[:, idx, idx] = (dt ** 3 / 3.0)[:, None]
+        Q[:, idx, idx + 3] = (dt ** 2 / 2.0)[:, None]
+        Q[:, idx + 3, idx] = (dt ** 2 / 2.0)[:, None]
+        Q[:, idx + 3, idx + 3] = dt[:, None]
+        Q = Q * self.plant_noise
+        Q[:, 6, 6] = dt * self.turn_rate_noise
+        return F, Q
+
+    def predict_batch(self, Sf, Pf, dt):
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (Sf.shape[0],))
+        F, Q = self.transition_matrices(dt, Sf)
+        x, y, z, vx, vy, vz, w = (Sf[:, i, 0] for i in range(7))
+        s, c, A, B, _, _ = self._turn_terms(w, dt)
+        Sp = np.stack([
+            x + A * vx - B * vy,
+            y + B * vx + A * vy,
+            z + vz * dt,
+            c * vx - s * vy,
+            s * vx + c * vy,
+            vz,
+            w,
+        ], axis=1)[:, :, np.newaxis].astype(Sf.dtype, copy=False)
+        F, Q = F.astype(Sf.dtype, copy=False), Q.astype(Sf.dtype, copy=False)
+        Pp = F @ Pf @ np.swapaxes(F, -1, -2) + Q
+        return Sp, Pp
+
+    def predict_step(self, current_time):
+        dt = current_time - self.prev_Time
+        print(f"Predict step with dt: {dt}")
+        F, Q = self.transition_matrices(dt, self.Sf[np.newaxis])
+        self.Phi, self.Q = F[0], Q[0]
+        Sp, Pp = self.predict_batch(self.Sf[np.newaxis], self.Pf[np.newaxis], dt)
+        self.Sp, self.Pp = Sp[0], Pp[0]
+        self.Meas_Time = current_time
+        self.prev_Time = current_time
+
+
+class IMMFilter(CVFilter):
+    # Interacting multiple model filter over CV, CA and CT.
+    # Every model lives in a common 10-state space [x, y, z, vx, vy, vz, ax, ay, az, omega];
+    # each model only propagates its own components. Model states are stacked as
+    # (N, M, 10, 1) / (N, M, 10, 10) and mode probabilities as (N, M), so mixing,
+    # probability update and output combination are array operations over all
+    # tracks and models. Only the loop over the three models remains in Python.
+    def __init__(self, p_stay=0.95):
+        super().__init__()
+        self.models = [CVFilter(), CAFilter(), CTFilter()]
+        self.model_names = ['CV', 'CA', 'CT']
+        self.model_states = [np.arange(6), np.arange(9), np.r_[0:6, 9]]
+        n_models = len(self.models)
+        self.TPM = np.full((n_models, n_models), (1.0 - p_stay) / (n_models - 1))
+        np.fill_diagonal(self.TPM, p_stay)
+
+        self.Sf = np.zeros((10, 1))
+        self.Pf = np.eye(10)
+        self.Pf[9, 9] = np.deg2rad(5.0) ** 2
+        self.Sp = np.zeros((10, 1))
+        self.Pp = np.eye(10)
+        self.H = np.eye(3, 10)
+        self.mu = np.full(n_models, 1.0 / n_models)  # Mode probabilities
+        self.model_Sf = np.tile(self.Sf, (n_models, 1, 1))
+        self.model_Pf = np.tile(self.Pf, (n_models, 1, 1))
+        self.model_Sp = self.model_Sf.copy()
+        self.model_Pp = self.model_Pf.copy()
+        self.mode_c = self.mu.copy()  # Predicted mode probabilities
+
+    snapshot_attrs = CVFilter.snapshot_attrs + ('model_Sf', 'model_Pf', 'mu')
+
+    def initialize_filter_state(self, x, y, z, vx, vy, vz, time):
+        super().initialize_filter_state(x, y, z, vx, vy, vz, time)
+        self.model_Sf[:] = self.Sf
+
+    def transition_matrices(self, dt, Sf=None):
+        # Linearised transition of the combined 10-state output (CA motion, constant turn rate), used by smoothing
+        Phi_ca, Q_ca = self.models[1].transition_matrices(dt)
+        n = Phi_ca.shape[0]
+        Phi = np.tile(np.eye(10), (n, 1, 1))
+        Phi[:, :9, :9] = Phi_ca
+        Q = np.zeros((n, 10, 10))
+        Q[:, :9, :9] = Q_ca
+        Q[:, 9, 9] = np.atleast_1d(dt) * self.models[2].turn_rate_noise
+        return Phi, Q
+
+    def mix(self, X, P, mu):
+        # Interaction step; X (N, M, 10, 1), P (N, M, 10, 10), mu (N, M)
+        c = mu @ self.TPM  # c[n, j] = sum_i p_ij mu_i
+        w = mu[:, :, np.newaxis] * self.TPM[np.newaxis] / c[:, np.newaxis, :]  # w[n, i, j] = mu_i|j
+        X0 = np.einsum('nij,nikl->njkl', w, X)
+        d = X[:, :, np.newaxis] - X0[:, np.newaxis, :]  # (N, Mi, Mj, 10, 1)
+        spread = d @ np.swapaxes(d, -1, -2)
+        P0 = np.einsum('nij,nikl->njkl', w, P) + np.einsum('nij,nijkl->njkl', w, spread)
+        return X0, P0, c
+
+    def combine(self, X, P, mu):
+        # Moment-matched output over all models, returns (N, 10, 1) and (N, 10, 10)
+        x = np.einsum('nm,nmkl->nkl', mu, X)
+        d = X - x[:, np.newaxis]
+        Pc = np.einsum('nm,nmkl->nkl', mu, P + d @ np.swapaxes(d, -1, -2))
+        return x, Pc
+
+    def _run_models(self, X, P, step):
+        # Apply step(model, Xsub, Psub) to each model's sub-state and embed the result back
+        X_out, P_out = X.copy(), P.copy()
+        extras = []
+        for m, (model, idx) in enumerate(zip(self.models, self.model_states)):
+            Xs = X[:, m][:, idx]
+            Ps = P[:, m][:, idx[:, None], idx]
+            Xs, Ps, *extra = step(model, Xs, Ps)
+            X_out[:, m][:, idx] = Xs
+            block = np.zeros_like(P[:, m])
+            block[:, idx[:, None], idx] = Ps
+            others = np.setdiff1d(np.arange(X.shape[-2]), idx)
+            block[:, others, others] = P[:, m][:, others, others]  # Unmodelled components keep their mixed variance
+            P_out[:, m] = block
+            extras.append(extra)
+        return X_out, P_out, extras
+
+    def predict_batch(self, X, P, mu, dt):
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (X.shape[0],))
+        X0, P0, c = self.mix(X, P, mu)
+        Xp, Pp, _ = self._run_models(X0, P0, lambda model, Xs, Ps: model.predict_batch(Xs, Ps, dt))
+        return Xp, Pp, c
+
+    def update_batch(self, Xp, Pp, c, Z, R=None):
+        Xf, Pf, extras = self._run_models(Xp, Pp, lambda model, Xs, Ps: model.update_batch(Xs, Ps, Z, R))
+        log_lik = np.stack([innovation_log_likelihoods(Inn[..., 0], S)[1] for Inn, S in extras], axis=1)
+        log_mu = np.log(c) + log_lik
+        mu = np.exp(log_mu - logsumexp(log_mu, axis=1, keepdims=True))
+        return Xf, Pf, mu
+
+    def seed_filters(self, filters, states, covs, times):
+        super().seed_filters(filters, states, covs, times)
+        for f in filters:
+            f.model_Sf[:] = f.Sf
+            f.model_Pf[:] = f.Pf
+
+    def coast_filters(self, filters, time):
+        times = np.broadcast_to(np.asarray(time, dtype=float), (len(filters),))
+        X = np.stack([f.model_Sf for f in filters])
+        P = np.stack([f.model_Pf for f in filters])
+        mu = np.stack([f.mu for f in filters])
+        dt = np.maximum(times - np.array([f.prev_Time for f in filters], dtype=float), 0.0)
+        Xp, Pp, c = self.predict_batch(X, P, mu, dt)
+        Sp, Ppc = self.combine(Xp, Pp, c)
+        for i, (f, time) in enumerate(zip(filters, times)):
+            f.oosm_buffer.append((time, None, None, f.snapshot()))
+            f.model_Sp, f.model_Pp, f.mode_c = Xp[i], Pp[i], c[i]
+            f.model_Sf, f.model_Pf, f.mu = Xp[i].copy(), Pp[i].copy(), c[i].copy()
+            f.Sp, f.Pp = Sp[i], Ppc[i]
+            f.Sf, f.Pf = Sp[i].copy(), Ppc[i].copy()
+            f.prev_Time = f.Meas_Time = time
+
+    def predict_snapshots(self, snapshots, time):
+        X = np.stack([s['model_Sf'] for s in snapshots])
+        P = np.stack([s['model_Pf'] for s in snapshots])
+        mu = np.stack([s['mu'] for s in snapshots])
+        dt = np.maximum(np.asarray(time, dtype=float) - np.array([s['prev_Time'] for s in snapshots], dtype=float), 0.0)
+        Xp, Pp, c = self.predict_batch(X, P, mu, dt)
+        Sp, Ppc = self.combine(Xp, Pp, c)
+        return (Xp, Pp, c, Sp, Ppc), Sp, Ppc
+
+    def update_snapshots(self, prediction, index, Z, R, time):
+        Xp, Pp, c, Sp, Ppc = (a[index] for a in prediction)
+        Xf, Pf, mu = (Xp, Pp, c) if Z is None else self.update_batch(Xp, Pp, c, Z, R)
+        Sf, Pfc = self.combine(Xf, Pf, mu)
+        return [{'Sf': Sf[i], 'Pf': Pfc[i], 'Sp': Sp[i], 'Pp': Ppc[i], 'model_Sf': Xf[i], 'model_Pf': Pf[i],
+                 'mu': mu[i], 'prev_Time': np.float64(time), 'Meas_Time': np.float64(time)} for i in range(len(index))]
+
+    def predict_step(self, current_time):
+        dt = current_time - self.prev_Time
+        print(f"Predict step with dt: {dt}")
+        Xp, Pp, c = self.predict_batch(self.model_Sf[np.newaxis], self.model_Pf[np.newaxis], self.mu[np.newaxis], dt)
+        self.model_Sp, self.model_Pp, self.mode_c = Xp[0], Pp[0], c[0]
+        Sp, Pp = self.combine(Xp, Pp, c)
+        self.Sp, self.Pp = Sp[0], Pp[0]
+        self.Meas_Time = current_time
+        self.prev_Time = current_time
+
+    def update_step(self, Z, R=None):
+        print(f"Update step with measurement Z: {Z}")
+        Z = np.asarray(Z, dtype=float).reshape(1, -1, 1)
+        Xf, Pf, mu = self.update_batch(self.model_Sp[np.newaxis], self.model_Pp[np.newaxis], self.mode_c[np.newaxis], Z,
+                                       None if R is None else np.asarray(R)[np.newaxis])
+        self.model_Sf, self.model_Pf, self.mu = Xf[0], Pf[0], mu[0]
+        Sf, Pf = self.combine(Xf, Pf, mu)
+        self.Sf, self.Pf = Sf[0], Pf[0]
+        print(f"IMM mode probabilities: {dict(zip(self.model_names, np.round(self.mu, 3)))}")
 
 
 def read_measurements_from_csv(file_path):
-    measurements = []
+    measurements = list(iter_measurements_from_csv(file_path))
+    for mr, ma, me, _, _, x, y, z in measurements:
+        print(f"Converted spherical to Cartesian: azimuth={ma}, elevation={me}, range={mr} -> x={x}, y={y}, z={z}")
+    return measurements
+
+
+def iter_measurements_from_csv(file_path):
+    # Yields the reports one row at a time so a reader stage can stream the recording; silent, as the
+    # pipeline's reader thread runs it
     with open(file_path, 'r') as file:
         reader = csv.reader(file)
         next(reader)  # Skip header if exists
@@ -122,9 +743,35 @@ def read_measurements_from_csv(file_path):
             mt = float(row[13])  # MT column
             md = float(row[14])
             x, y, z = sph2cart(ma, me, mr)  # Convert spherical to Cartesian coordinates
-            print(f"Converted spherical to Cartesian: azimuth={ma}, elevation={me}, range={mr} -> x={x}, y={y}, z={z}")
-            measurements.append((mr, ma, me, mt, md, x, y, z))
-    return measurements
+            yield (mr, ma, me, mt, md, x, y, z)
+
+def measurement_to_cart(measurement):
+    # Measurements are stored as (range, azimuth, elevation, time, doppler, ...)
+    return sph2cart(measurement[1], measurement[2], measurement[0])
+
+
+def converted_measurement_covariance(measurements, range_sigma, azimuth_sigma, elevation_sigma):
+    # Cartesian covariance J diag(sigma^2) J^T of every (range, azimuth, elevation) report at once, shape (N, 3, 3).
+    # J is the Jacobian of sph2cart; angles and their sigmas are in degrees.
+    measurements = np.asarray(measurements, dtype=float).reshape(-1, 3)
+    r = measurements[:, 0]
+    az = np.radians(measurements[:, 1])
+    el = np.radians(measurements[:, 2])
+    sin_az, cos_az = np.sin(az), np.cos(az)
+    sin_el, cos_el = np.sin(el), np.cos(el)
+
+    J = np.zeros((measurements.shape[0], 3, 3))
+    J[:, 0, 0] = cos_el * sin_az
+    J[:, 1, 0] = cos_el * cos_az
+    J[:, 2, 0] = sin_el
+    J[:, 0, 1] = r * cos_el * cos_az
+    J[:, 1, 1] = -r * cos_el * sin_az
+    J[:, 0, 2] = -r * sin_el * sin_az
+    J[:, 1, 2] = -r * sin_el * cos_az
+    J[:, 2, 2] = r * cos_el
+    variances = np.array([range_sigma, np.radians(azimuth_sigma), np.radians(elevation_sigma)]) ** 2
+    return (J * variances) @ np.swapaxes(J, -1, -2)
+
 
 def sph2cart(az, el, r):
     x = r * np.cos(el * np.pi / 180) * np.sin(az * np.pi / 180)
@@ -138,10 +785,8 @@ def cart2sph(x, y, z):
     el = math.atan2(z, np.sqrt(x**2 + y**2)) * 180 / np.pi
     az = math.atan2(y, x)
 
-    if x > 0.0:
-        az = np.pi / 2 - az
-    else:
-        az = 3 * np.pi / 2 - az
+    # Azimuth is measured from +y towards +x (matching sph2cart), in every quadrant
+    az = np.pi / 2 - az
 
     az = az * 180 / np.pi
 
@@ -155,80 +800,157 @@ def cart2sph(x, y, z):
     return r, az, el
 
 
+def prefilter_measurements(measurements, config_data):
+    # Drop reports outside the configured range, azimuth, elevation and altitude windows before grouping.
+    # All limits are tested over the whole recording at once.
+    if not measurements:
+        return measurements
+    data = np.array([(m[0], m[1], m[2], m[7]) for m in measurements], dtype=float)
+    r, az, el, altitude = data.T
+    keep = np.ones(len(measurements), dtype=bool)
+    for values, (low, high) in ((r, config_data['range_gate']), (el, config_data['elevation_gate']),
+                                (altitude, config_data['target_altitude'])):
+        keep &= (values >= low) & (values <= high)
+
+    # The azimuth window may wrap through north (e.g. 350 to 10 degrees)
+    az_low, az_high = config_data['azimuth_gate']
+    az = np.mod(az, 360.0)
+    if az_low <= az_high:
+        keep &= (az >= az_low) & (az <= az_high)
+    else:
+        keep &= (az >= az_low) | (az <= az_high)
+
+    print(f"Pre-filter kept {int(keep.sum())} of {len(measurements)} measurements")
+    return [m for m, k in zip(measurements, keep) if k]
+
+
+def initiation_speed_mask(tracks, reports, time, speed_window):
+    # (T, R) mask of the track/report pairs allowed by the target speed window. Only tracks still in
+    # initiation are tested: their velocity comes from exactly this pair of reports.
+    allowed = np.ones((len(tracks), len(reports)), dtype=bool)
+    if speed_window is None or not len(reports):
+        return allowed
+    initiating = np.array([track['current_state'] != 'Firm' for track in tracks], dtype=bool)
+    if not initiating.any():
+        return allowed
+    last = [track['measurements'][-1][0] for track, flag in zip(tracks, initiating) if flag]
+    last_positions = np.array([measurement_to_cart(m) for m in last])
+    dt = time - np.array([m[3] for m in last])
+    distance = np.linalg.norm(np.asarray(reports)[np.newaxis] - last_positions[:, np.newaxis], axis=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = distance / dt[:, np.newaxis]
+    allowed[initiating] = (speed >= speed_window[0]) & (speed <= speed_window[1])
+    return allowed
+
+
 def form_measurement_groups(measurements, max_time_diff=0.050):
-    measurement_groups = []
+    return list(iter_measurement_groups(measurements, max_time_diff))
+
+
+def iter_measurement_groups(measurements, max_time_diff=0.050):
+    # Yields each group as soon as the next report closes it; the group base time is its first report
     current_group = []
-    base_time = measurements[0][3]
 
     for measurement in measurements:
-        if measurement[3] - base_time <= max_time_diff:
+        # A report older than the group base time (late arrival) starts its own group
+        if current_group and 0 <= measurement[3] - current_group[0][3] <= max_time_diff:
             current_group.append(measurement)
         else:
-            measurement_groups.append(current_group)
+            if current_group:
+                yield current_group
             current_group = [measurement]
-            base_time = measurement[3]
 
     if current_group:
-        measurement_groups.append(current_group)
-
-    return measurement_groups
-
-
-def form_clusters_via_association(tracks, reports, kalman_filter):
-    association_list = []
-    cov_inv = np.linalg.inv(kalman_filter.Pp[:3, :3])  # 3x3 covariance matrix for position only
-    chi2_threshold = kalman_filter.gate_threshold
-
-    for i, track in enumerate(tracks):
-        for j, report in enumerate(reports):
-            distance = mahalanobis_distance(track, report, cov_inv)
-            if distance < chi2_threshold:
-                association_list.append((i, j))
-
-    clusters = []
-    while association_list:
-        cluster_tracks = set()
-        cluster_reports = set()
-        stack = [association_list.pop(0)]
-
-        while stack:
-            track_idx, report_idx = stack.pop()
-            cluster_tracks.add(track_idx)
-            cluster_reports.add(report_idx)
-            new_assoc = [(t, r) for t, r in association_list if t == track_idx or r == report_idx]
-            for assoc in new_assoc:
-                if assoc not in stack:
-                    stack.append(assoc)
-            association_list = [assoc for assoc in association_list if assoc not in new_assoc]
-
-        clusters.append((list(cluster_tracks), [reports[r] for r in cluster_reports]))
-
-    return clusters
-
-
-def mahalanobis_distance(track, report, cov_inv):
-    residual = np.array(report) - np.array(track)
-    distance = np.dot(np.dot(residual.T, cov_inv), residual)
-    return distance
-
-
-def select_best_report(cluster_tracks, cluster_reports, kalman_filter):
-    cov_inv = np.linalg.inv(kalman_filter.Pp[:3, :3])
-
-    best_report = None
-    best_track_idx = None
-    max_weight = -np.inf
-
-    for i, track in enumerate(cluster_tracks):
-        for j, report in enumerate(cluster_reports):
-            residual = np.array(report) - np.array(track)
-            weight = np.exp(-0.5 * np.dot(np.dot(residual.T, cov_inv), residual))
-            if weight > max_weight:
-                max_weight = weight
-                best_report = report
-                best_track_idx = i
-
-    return best_track_idx, best_report
+        yield current_group
+
+
+def predict_track_measurements(tracks, time, kalman_filter, use_doppler=False):
+    # Batched prediction of every track's filter to the scan time.
+    # Returns predicted measurements (T, m) and their covariances H Pp H^T (T, m, m), m = 3 or 4 with doppler;
+    # the report noise is added per pair at gating time.
+    m = 4 if use_doppler else 3
+    if not tracks:
+        return np.zeros((0, m)), np.zeros((0, m, m))
+
+    kernel = tracks[0]['filter']
+    Sp, Pp = kernel.predict_filters([track['filter'] for track in tracks], time)
+    z_pred, H, _ = kernel.measurement_model(Sp, m)
+    S = H @ Pp @ np.swapaxes(H, -1, -2)
+    z_pred = z_pred[:, :, 0].copy()
+
+    # Tracks without a velocity estimate yet gate around their last report with the reference covariance
+    no_velocity = np.array([not track['filter'].second_rep_flag for track in tracks])
+    if no_velocity.any():
+        last = [track['measurements'][-1][0] for track, flag in zip(tracks, no_velocity) if flag]
+        z_pred[no_velocity, :3] = [measurement_to_cart(measurement) for measurement in last]
+        S[no_velocity] = 0.0
+        S[no_velocity, :3, :3] = kalman_filter.Pp[:3, :3]
+        if use_doppler:
+            z_pred[no_velocity, 3] = [measurement[4] for measurement in last]
+            S[no_velocity, 3, 3] = kernel.doppler_gate_sigma ** 2
+    return z_pred, S
+
+
+def pair_log_likelihoods(predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers=None,
+                         allowed=None):
+    # Squared Mahalanobis distance and Gaussian log-likelihood for every track/report pair, both (T, R), and the
+    # matching chi-square gate. Each pair uses its own innovation covariance S = H Pp H^T (track) + R (report),
+    # factorised once for both terms; with dopplers the gate is joint over position and doppler (4 degrees of freedom).
+    predictions = np.asarray(predictions)
+    reports = np.asarray(reports, dtype=predictions.dtype).reshape(-1, 3)
+    if report_dopplers is not None:
+        reports = np.column_stack([reports, np.asarray(report_dopplers, dtype=predictions.dtype)])
+    residual = reports[np.newaxis, :, :] - predictions[:, np.newaxis, :]  # (T, R, m)
+    S = prediction_covs[:, np.newaxis] + report_covs[np.newaxis]  # (T, R, m, m)
+    distances, log_lik = innovation_log_likelihoods(residual, S)
+    if allowed is not None:
+        distances = np.where(allowed, distances, np.inf)  # Pairs rejected before gating (e.g. initiation speed)
+        log_lik = np.where(allowed, log_lik, -np.inf)
+    if reports.shape[1] == 4:
+        return distances, log_lik, kalman_filter.doppler_gate_threshold
+    return distances, log_lik, kalman_filter.gate_threshold
+
+
+def gating_distances(predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers=None, allowed=None):
+    # Squared Mahalanobis distance for every track/report pair, shape (T, R), and the matching chi-square gate
+    distances, _, threshold = pair_log_likelihoods(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                                   report_dopplers, allowed)
+    return distances, threshold
+
+
+def innovation_log_likelihoods(residual, S):
+    # Squared Mahalanobis distance and Gaussian log-likelihood of residuals (..., m) under covariances (..., m, m),
+    # both from one Cholesky factorisation of S. If rounding has left some S indefinite, the stack is
+    # factorised by eigh instead, with the eigenvalues floored at rounding level, rather than failing the scan.
+    S = 0.5 * (S + np.swapaxes(S, -1, -2))
+    try:
+        L = np.linalg.cholesky(S)
+        whitened = np.linalg.solve(L, residual[..., np.newaxis])[..., 0]
+        log_det = 2.0 * np.sum(np.log(np.diagonal(L, axis1=-2, axis2=-1)), axis=-1)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(S)
+        floor = np.finfo(S.dtype).eps * S.shape[-1] * np.max(np.abs(eigenvalues), axis=-1, keepdims=True)
+        eigenvalues = np.maximum(eigenvalues, np.maximum(floor, np.finfo(S.dtype).tiny))
+        whitened = (np.swapaxes(eigenvectors, -1, -2) @ residual[..., np.newaxis])[..., 0] / np.sqrt(eigenvalues)
+        log_det = np.sum(np.log(eigenvalues), axis=-1)
+    distances = np.sum(whitened ** 2, axis=-1)
+    log_2pi = residual.dtype.type(np.log(2 * np.pi))  # A float64 constant would promote float32 filter banks
+    return distances, -0.5 * (distances + log_det + residual.shape[-1] * log_2pi)
+
+
+def group_associations(gated):
+    # Connected components of the gated pairs of a (T, R) mask -> list of (track indices, report indices),
+    # ordered by each cluster's first track. One sparse graph pass over tracks and reports as nodes.
+    T, R = gated.shape
+    rows, cols = np.nonzero(gated)
+    graph = coo_matrix((np.ones(rows.size), (rows, T + cols)), shape=(T + R, T + R))
+    _, labels = connected_components(graph, directed=False)
+    groups = {}
+    for track in np.unique(rows).tolist():
+        groups.setdefault(labels[track], ([], []))[0].append(track)
+    for report in np.unique(cols).tolist():
+        groups[labels[T + report]][1].append(report)
+    return list(groups.values())
 
 
 def select_initiation_mode(mode):
@@ -246,10 +968,25 @@ def doppler_correlation(doppler_1, doppler_2, doppler_threshold):
     return abs(doppler_1 - doppler_2) < doppler_threshold
 
 
-def correlation_check(track, measurement, doppler_threshold, range_threshold):
+def measurement_vector(measurement, use_doppler=False):
+    # Cartesian position, optionally followed by the measured range rate, as a column vector
+    z = measurement_to_cart(measurement)
+    if use_doppler:
+        z = z + (measurement[4],)
+    return np.array(z, dtype=float).reshape(-1, 1)
+
+
+def correlation_check(track, measurement, doppler_threshold, range_threshold, use_doppler=False):
+    if use_doppler and track['current_state'] == 'Firm' and 'filter' in track:
+        # 4-D gate: position plus range rate against the track prediction
+        track_filter = track['filter']
+        R = track_filter.measurement_covariances([measurement], True)[0]
+        distance = track_filter.innovation_distance(measurement_vector(measurement, True), measurement[3], R)
+        return distance < track_filter.doppler_gate_threshold
+
     last_measurement = track['measurements'][-1][0]
-    last_cartesian = sph2cart(last_measurement[0], last_measurement[1], last_measurement[2])
-    measurement_cartesian = sph2cart(measurement[0], measurement[1], measurement[2])
+    last_cartesian = measurement_to_cart(last_measurement)
+    measurement_cartesian = measurement_to_cart(measurement)
     distance = np.linalg.norm(np.array(measurement_cartesian) - np.array(last_cartesian))
 
     doppler_correlated = doppler_correlation(measurement[4], last_measurement[4], doppler_threshold)
@@ -258,38 +995,145 @@ def correlation_check(track, measurement, doppler_threshold, range_threshold):
     return doppler_correlated and range_satisfied
 
 
+def initiate_tracks(entries):
+    # Batch initiation for every (track, report) pair of a scan where the track is not yet Firm.
+    # A weighted least-squares constant-velocity fit over all of the track's initiation reports
+    # (plain two-point differencing when it has two) gives position and velocity at the newest
+    # report with their covariance, and all filters are seeded together.
+    if not entries:
+        return
+    histories = [[m for m, _ in track['measurements']] + [measurement] for track, measurement in entries]
+    N, K = len(histories), max(len(history) for history in histories)
+    polar = np.zeros((N, K, 3))
+    times = np.zeros((N, K))
+    mask = np.zeros((N, K), dtype=bool)
+    for i, history in enumerate(histories):
+        polar[i, :len(history)] = [m[:3] for m in history]
+        times[i, :len(history)] = [m[3] for m in history]
+        mask[i, :len(history)] = True
+    positions = np.stack(sph2cart(polar[..., 1], polar[..., 2], polar[..., 0]), axis=-1)  # (N, K, 3)
+
+    # Per-axis weights from each report's noise; padding gets zero weight
+    kernel = entries[0][0]['filter']
+    variances = np.diagonal(kernel.measurement_covariances(polar.reshape(-1, 3)), axis1=1, axis2=2).reshape(N, K, 3)
+    weights = np.divide(1.0, variances, out=np.zeros_like(variances), where=mask[..., np.newaxis] & (variances > 0))
+    newest = np.array([history[-1][3] for history in histories])
+    tau = (times - newest[:, np.newaxis])[..., np.newaxis]  # Time relative to the newest report, (N, K, 1)
+
+    S0 = np.sum(weights, axis=1)
+    S1 = np.sum(weights * tau, axis=1)
+    S2 = np.sum(weights * tau ** 2, axis=1)
+    Y0 = np.sum(weights * positions, axis=1)
+    Y1 = np.sum(weights * tau * positions, axis=1)
+    det = S0 * S2 - S1 ** 2
+    valid = np.all(det > 1e-12 * S0 * S0, axis=1)  # Needs reports at two distinct times
+    for (track, measurement), ok in zip(entries, valid):
+        if not ok:
+            print(f"Track {track['track_id']}: initiation reports share one time, velocity left unchanged")
+    if not valid.any():
+        return
+    det = np.where(valid[:, np.newaxis], det, 1.0)
+
+    states = np.concatenate([(S2 * Y0 - S1 * Y1) / det, (S0 * Y1 - S1 * Y0) / det], axis=1)  # (N, 6)
+    idx = np.arange(3)
+    covs = np.zeros((N, 6, 6))
+    covs[:, idx, idx] = S2 / det
+    covs[:, idx, idx + 3] = -S1 / det
+    covs[:, idx + 3, idx] = -S1 / det
+    covs[:, idx + 3, idx + 3] = S0 / det
+
+    seeded = [track['filter'] for (track, _), ok in zip(entries, valid) if ok]
+    kernel.seed_filters(seeded, states[valid], covs[valid], newest[valid])
+
+
 def initialize_filter_state(kalman_filter, x, y, z, vx, vy, vz, time):
     kalman_filter.initialize_filter_state(x, y, z, vx, vy, vz, time)
 
 
-def perform_jpda(tracks, reports, kalman_filter):
-    clusters = form_clusters_via_association(tracks, reports, kalman_filter)
+def create_filter(filter_option, steady_state_gain=False, dtype=np.float64, measurement_sigmas=None, plant_noise=None):
+    if filter_option == "CV":
+        kalman_filter = CVFilter()
+    elif filter_option == "CA":
+        kalman_filter = CAFilter()
+    elif filter_option == "CT":
+        kalman_filter = CTFilter()
+    elif filter_option == "IMM":
+        kalman_filter = IMMFilter()
+    else:
+        raise ValueError("Invalid filter option selected.")
+    kalman_filter.steady_state_gain = steady_state_gain
+    if measurement_sigmas is not None:
+        # (range m, azimuth deg, elevation deg): per-report R from the polar accuracies
+        kalman_filter.polar_noise = True
+        kalman_filter.range_sigma, kalman_filter.azimuth_sigma, kalman_filter.elevation_sigma = measurement_sigmas
+    if plant_noise is not None:
+        for noisy_filter in [kalman_filter] + getattr(kalman_filter, 'models', []):
+            noisy_filter.plant_noise = plant_noise
+    kalman_filter.set_dtype(dtype)
+    return kalman_filter
+
+
+def score_jpda_cluster(cluster_tracks, cluster_reports, log_lik, reports):
+    # Hypotheses, normalised probabilities and best hypothesis of one cluster
+    cluster_hypotheses = [(track, reports[report]) for track in cluster_tracks for report in cluster_reports]
+
+    # Normalize in the log domain: log-sum-exp keeps well-separated pairs from underflowing to 0/0
+    cluster_log_lik = log_lik[np.ix_(cluster_tracks, cluster_reports)].ravel()
+    cluster_probabilities = np.exp(cluster_log_lik - logsumexp(cluster_log_lik))
+
+    # Select the best hypothesis based on the highest probability
+    best_hypothesis_index = np.argmax(cluster_log_lik)
+    return cluster_hypotheses, cluster_probabilities.tolist(), [cluster_hypotheses[best_hypothesis_index]]
+
+
+def assign_capped_cluster(cluster_tracks, cluster_reports, distances, reports, chi2_threshold):
+    # Oversized cluster under a latency budget: one gated assignment instead of hypothesis scoring
+    block = distances[np.ix_(cluster_tracks, cluster_reports)]
+    rows, cols = linear_sum_assignment(np.where(block < chi2_threshold, block, 1e12))
+    assigned = [(cluster_tracks[row], reports[cluster_reports[col]]) for row, col in zip(rows, cols)
+                if block[row, col] < chi2_threshold]
+    return assigned, [1.0] * len(assigned), assigned
+
+
+def perform_jpda(predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers=None,
+                 allowed=None, executor=None, parallel_cluster_size=64, max_cluster_pairs=None, gating_rows=32):
+    # Gate all pairs at once; the same factorisation gives the hypothesis log-likelihoods.
+    # With an executor the pairs are factorised in blocks of gating_rows tracks on the pool.
+    if executor is not None and len(predictions) > gating_rows:
+        blocks = [executor.submit(pair_log_likelihoods, predictions[k:k + gating_rows], prediction_covs[k:k + gating_rows],
+                                  reports, report_covs, kalman_filter, report_dopplers,
+                                  None if allowed is None else allowed[k:k + gating_rows])
+                  for k in range(0, len(predictions), gating_rows)]
+        blocks = [block.result() for block in blocks]
+        distances = np.concatenate([block[0] for block in blocks])
+        log_lik = np.concatenate([block[1] for block in blocks])
+        chi2_threshold = blocks[0][2]
+    else:
+        distances, log_lik, chi2_threshold = pair_log_likelihoods(predictions, prediction_covs, reports, report_covs,
+                                                                  kalman_filter, report_dopplers, allowed)
+    cluster_indices = group_associations(distances < chi2_threshold)
+    clusters = [(cluster_tracks, [reports[r] for r in cluster_reports]) for cluster_tracks, cluster_reports in cluster_indices]
     best_reports = []
     hypotheses = []
     probabilities = []
 
-    for cluster_tracks, cluster_reports in clusters:
-        # Generate hypotheses for each cluster
-        cluster_hypotheses = []
-        cluster_probabilities = []
-        for track in cluster_tracks:
-            for report in cluster_reports:
-                # Calculate the probability of the hypothesis
-                cov_inv = np.linalg.inv(kalman_filter.Pp[:3, :3])
-                residual = np.array(report) - np.array(track)
-                probability = np.exp(-0.5 * np.dot(np.dot(residual.T, cov_inv), residual))
-                cluster_hypotheses.append((track, report))
-                cluster_probabilities.append(probability)
-
-        # Normalize probabilities
-        total_probability = sum(cluster_probabilities)
-        cluster_probabilities = [p / total_probability for p in cluster_probabilities]
-
-        # Select the best hypothesis based on the highest probability
-        best_hypothesis_index = np.argmax(cluster_probabilities)
-        best_track, best_report = cluster_hypotheses[best_hypothesis_index]
-
-        best_reports.append((best_track, best_report))
+    # Clusters are independent: those with at least parallel_cluster_size pairs are scored on the thread pool
+    # (the NumPy/SciPy work releases the GIL), small ones stay inline. Results are collected in cluster order,
+    # so the output does not depend on thread scheduling.
+    # With max_cluster_pairs set (latency budget), larger clusters are assigned instead of scored.
+    results = []
+    for cluster_tracks, cluster_reports in cluster_indices:
+        if max_cluster_pairs is not None and len(cluster_tracks) * len(cluster_reports) > max_cluster_pairs:
+            results.append(assign_capped_cluster(cluster_tracks, cluster_reports, distances, reports, chi2_threshold))
+        elif executor is not None and len(cluster_tracks) * len(cluster_reports) >= parallel_cluster_size:
+            results.append(executor.submit(score_jpda_cluster, cluster_tracks, cluster_reports, log_lik, reports))
+        else:
+            results.append(score_jpda_cluster(cluster_tracks, cluster_reports, log_lik, reports))
+
+    for result in results:
+        cluster_hypotheses, cluster_probabilities, best_hypotheses = (
+            result.result() if isinstance(result, Future) else result)
+        best_reports.extend(best_hypotheses)
         hypotheses.append(cluster_hypotheses)
         probabilities.append(cluster_probabilities)
 
@@ -301,19 +1145,15 @@ def perform_jpda(tracks, reports, kalman_filter):
 
     return clusters, best_reports, hypotheses, probabilities
 
-def perform_munkres(tracks, reports, kalman_filter):
-    cost_matrix = []
-    cov_inv = np.linalg.inv(kalman_filter.Pp[:3, :3])
-
-    for track in tracks:
-        track_costs = []
-        for report in reports:
-            distance = mahalanobis_distance(track, report, cov_inv)
-            track_costs.append(distance)
-        cost_matrix.append(track_costs)
+def perform_munkres(predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers=None,
+                    allowed=None):
+    cost_matrix, chi2_threshold = gating_distances(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                                   report_dopplers, allowed)
 
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
-    best_reports = [(row, reports[col]) for row, col in zip(row_ind, col_ind)]
+    # Pairs outside the gate get a prohibitive cost and are dropped after the assignment
+    gated_costs = np.where(cost_matrix < chi2_threshold, cost_matrix, 1e12)
+    row_ind, col_ind = linear_sum_assignment(gated_costs)
+    best_reports = [(row, reports[col]) for row, col in zip(row_ind, col_ind) if cost_matrix[row, col] < chi2_threshold]
 
     # Log cost matrix and assignments
     print("Munkres Cost Matrix:", cost_matrix)
@@ -323,10 +1163,235 @@ def perform_munkres(tracks, reports, kalman_filter):
     return best_reports
 
 
+class AuctionAssigner:
+    # Forward auction with epsilon scaling (Bertsekas) over sparse gated costs, an alternative to
+    # linear_sum_assignment. The problem is made square so every object ends up assigned: persons are the
+    # tracks plus one "clutter" person per report, objects are the reports plus one miss object per track.
+    # A track may take a gated report or its own miss (at the gate cost); a clutter person takes its own
+    # report (report left unassigned) or the miss object of any track gating that report, both free.
+    # Persons bid in Jacobi rounds. Prices carry over between scans keyed by track id: a track's miss object
+    # keeps its price and a new report starts at the last report price of the track that values it most;
+    # the uncontested best choices at those prices form the warm-start assignment. The total is within
+    # (T + R) * final_epsilon of optimal.
+    def __init__(self, final_epsilon=1e-3, scaling=5.0):
+        self.final_epsilon = final_epsilon
+        self.scaling = scaling
+        self.prices = {}  # track_id -> (price of the report it last won, price of its miss object)
+
+    def solve(self, rows, cols, costs, miss_costs, n_reports, track_ids=None):
+        # rows, cols, costs: gated (track, report) pairs; miss_costs (T,): cost of leaving each track unassigned.
+        # Returns the report index per track, -1 when unassigned.
+        T, R = len(miss_costs), n_reports
+        rows, cols = np.asarray(rows, dtype=int), np.asarray(cols, dtype=int)
+        persons = np.concatenate([rows, np.arange(T), T + np.arange(R), T + cols])
+        objects = np.concatenate([cols, R + np.arange(T), np.arange(R), R + rows])
+        benefit = np.concatenate([-np.asarray(costs, dtype=float), -np.asarray(miss_costs, dtype=float),
+                                  np.zeros(R + rows.size)])
+        prices = np.zeros(R + T)
+        epsilon = max(self.final_epsilon, (benefit.max() - benefit.min()) / self.scaling)
+
+        warm = track_ids is not None and any(track_id in self.prices for track_id in track_ids)
+        if warm and rows.size:
+            carried = np.array([self.prices.get(track_id, (0.0, 0.0)) for track_id in track_ids])
+            order = np.lexsort((rows, -benefit[:rows.size], cols))
+            first = order[np.r_[True, cols[order][1:] != cols[order][:-1]]]
+            prices[cols[first]] = carried[rows[first], 0]
+            prices[R:] = carried[:, 1]
+            assigned, owner = self._best_uncontested(persons, objects, benefit, prices)
+            epsilon = max(self.final_epsilon, epsilon / self.scaling)  # Carried prices are close: skip the coarsest phase
+        else:
+            assigned, owner = np.full(T + R, -1), np.full(R + T, -1)
+
+        while True:
+            self._bid(persons, objects, benefit, prices, assigned, owner, epsilon)
+            if epsilon <= self.final_epsilon:
+                break
+            epsilon = max(self.final_epsilon, epsilon / self.scaling)
+            assigned[:], owner[:] = -1, -1  # Next scaling phase keeps only the prices
+
+        assigned = assigned[:T]
+        if track_ids is not None:
+            for t, (track_id, obj) in enumerate(zip(track_ids, assigned)):
+                report_price = prices[obj] if obj < R else self.prices.get(track_id, (0.0, 0.0))[0]
+                self.prices[track_id] = (report_price, prices[R + t])
+        return np.where(assigned < R, assigned, -1)
+
+    def _best_uncontested(self, persons, objects, benefit, prices):
+        # Warm-start assignment: each person takes its best object at the carried prices unless another person wants it
+        value = benefit - prices[objects]
+        order = np.lexsort((-value, persons))
+        first = order[np.r_[True, persons[order][1:] != persons[order][:-1]]]
+        targets = objects[first]
+        unique, counts = np.unique(targets, return_counts=True)
+        uncontested = np.isin(targets, unique[counts == 1])
+        assigned = np.where(uncontested, targets, -1)
+        owner = np.full(prices.shape[0], -1)
+        owner[targets[uncontested]] = persons[first][uncontested]
+        return assigned, owner
+
+    def _bid(self, persons, objects, benefit, prices, assigned, owner, epsilon):
+        # Jacobi bidding rounds until every person holds an object; arrays are updated in place
+        while True:
+            entries = np.flatnonzero(assigned[persons] < 0)
+            if entries.size == 0:
+                return
+            value = benefit[entries] - prices[objects[entries]]
+            order = np.lexsort((-value, persons[entries]))
+            entries, value = entries[order], value[order]
+            first = np.r_[True, persons[entries][1:] != persons[entries][:-1]]
+            start = np.flatnonzero(first)
+            following = np.minimum(start + 1, entries.size - 1)
+            has_second = (start + 1 < entries.size) & ~first[following]
+            second = np.where(has_second, value[following], value[start])
+            bidders, targets = persons[entries[start]], objects[entries[start]]
+            bids = prices[targets] + value[start] - second + epsilon
+
+            # Each object goes to its highest bidder; the previous holder bids again next round
+            order = np.lexsort((-bids, targets))
+            winners = order[np.r_[True, targets[order][1:] != targets[order][:-1]]]
+            won = targets[winners]
+            previous = owner[won]
+            assigned[previous[previous >= 0]] = -1
+            owner[won] = bidders[winners]
+            assigned[bidders[winners]] = won
+            prices[won] = bids[winners]
+
+
+def perform_auction(predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers=None,
+                    allowed=None, assigner=None, track_ids=None):
+    # Same gating as perform_munkres, solved by the auction over the gated pairs only; a track left
+    # unassigned costs the gate threshold
+    distances, chi2_threshold = gating_distances(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                                 report_dopplers, allowed)
+    if assigner is None:
+        assigner = AuctionAssigner()
+    rows, cols = np.nonzero(distances < chi2_threshold)
+    assignment = assigner.solve(rows, cols, distances[rows, cols], np.full(distances.shape[0], chi2_threshold),
+                                distances.shape[1], track_ids)
+    best_reports = [(track, reports[report]) for track, report in enumerate(assignment) if report >= 0]
+
+    print("Auction Gated Pairs:", len(rows))
+    print("Auction Best Reports:", best_reports)
+
+    return best_reports
+
+
+class MultipleHypothesisTracker:
+    # Track-oriented MHT. Every Firm track keeps a tree of association hypotheses, stored as its leaves in
+    # track['mht_leaves']: a filter snapshot, a cumulative log-likelihood ratio and the reports taken over the
+    # last n_scan scans (None for a miss). Each scan every leaf branches on a miss and on each gated report,
+    # with all branches of all trees predicted, scored and updated in one batch. The global hypothesis is an
+    # assignment of tracks to reports (plus one miss column per track) on the best branch scores; each tree
+    # is then pruned to the leaves that agree with the chosen one n_scan scans back. max_hypotheses is a hard
+    # cap on the leaves per tree. Tracks still initiating share the reports left over, as with Munkres.
+    def __init__(self, n_scan=3, max_hypotheses=10, detection_probability=0.9, clutter_density=1e-9):
+        self.n_scan = n_scan
+        self.max_hypotheses = max(max_hypotheses, 1)
+        self.log_miss = np.log(1.0 - detection_probability)
+        self.log_detect = np.log(detection_probability / clutter_density)  # Target vs. clutter per m^3
+
+    def leaves(self, track):
+        # A filter moved outside the MHT (single-report scans, coasting, late reports) restarts its tree
+        track_filter = track['filter']
+        if track.get('mht_time') != track_filter.prev_Time:
+            track['mht_leaves'] = [{'snapshot': track_filter.snapshot(), 'score': 0.0, 'history': ()}]
+        return track['mht_leaves']
+
+    def associate(self, tracks, reports, predictions, prediction_covs, report_covs, kalman_filter, time,
+                  report_dopplers=None, allowed=None):
+        # Returns (track index, report) pairs like perform_munkres. Firm tracks are left holding the state of
+        # their selected hypothesis, so they must not be updated again with the returned report.
+        Z = np.asarray(reports, dtype=predictions.dtype).reshape(-1, 3)
+        if report_dopplers is not None:
+            Z = np.column_stack([Z, np.asarray(report_dopplers, dtype=Z.dtype)])
+        R, m = Z.shape
+        threshold = kalman_filter.doppler_gate_threshold if m == 4 else kalman_filter.gate_threshold
+        families = np.array([t for t, track in enumerate(tracks) if track['current_state'] == 'Firm'], dtype=int)
+        F = families.size
+        scores = np.full((F, R + F), -np.inf)  # Columns: reports, then one miss column per tree
+        scores[np.arange(F), R + np.arange(F)] = self.log_miss
+
+        # Expand every leaf of every tree in one batch; column R of branch_scores is the leaf's miss branch
+        branches = [[] for _ in range(F)]
+        if F:
+            kernel = tracks[families[0]]['filter']
+            leaves = [(f, leaf) for f, t in enumerate(families) for leaf in self.leaves(tracks[t])]
+            prediction, Sp, Pp = kernel.predict_snapshots([leaf['snapshot'] for _, leaf in leaves], time)
+            z_pred, H, _ = kernel.measurement_model(Sp, m)
+            residual = Z[np.newaxis] - z_pred[:, np.newaxis, :, 0]
+            S = (H @ Pp @ np.swapaxes(H, -1, -2))[:, np.newaxis] + report_covs[np.newaxis]
+            distances, log_lik = innovation_log_likelihoods(residual, S)
+            base = np.array([leaf['score'] for _, leaf in leaves])
+            branch_scores = np.where(distances < threshold, base[:, np.newaxis] + self.log_detect + log_lik, -np.inf)
+            branch_scores = np.column_stack([branch_scores, base + self.log_miss])
+            owner = np.array([f for f, _ in leaves])
+
+            # Hypothesis budget: each tree keeps its best branches, always including its best miss
+            kept = []
+            for f in range(F):
+                rows = np.flatnonzero(owner == f)
+                block = branch_scores[rows]
+                order = np.argsort(-block, axis=None, kind='stable')[:self.max_hypotheses]
+                choice = [divmod(int(k), R + 1) for k in order if np.isfinite(block.flat[k])]
+                if all(col != R for _, col in choice):
+                    choice = choice[:self.max_hypotheses - 1] + [(int(np.argmax(block[:, R])), R)]
+                kept.extend((f, rows[row], col) for row, col in choice)
+
+            hits = [(f, leaf, col) for f, leaf, col in kept if col < R]
+            misses = [(f, leaf, col) for f, leaf, col in kept if col == R]
+            snapshots = []
+            if hits:
+                cols = np.array([col for _, _, col in hits])
+                snapshots += kernel.update_snapshots(prediction, np.array([leaf for _, leaf, _ in hits]),
+                                                     Z[cols][..., np.newaxis], report_covs[cols], time)
+            if misses:
+                snapshots += kernel.update_snapshots(prediction, np.array([leaf for _, leaf, _ in misses]),
+                                                     None, None, time)
+            for (f, leaf, col), snapshot in zip(hits + misses, snapshots):
+                column = col if col < R else R + f
+                branches[f].append({'snapshot': snapshot, 'score': branch_scores[leaf, col], 'column': column,
+                                    'history': leaves[leaf][1]['history'] + (col if col < R else None,)})
+                scores[f, column] = max(scores[f, column], branch_scores[leaf, col])
+
+        # Global hypothesis selection over all trees
+        row_ind, col_ind = linear_sum_assignment(np.where(np.isfinite(scores), -scores, 1e12))
+        best_reports = [(int(families[f]), reports[col]) for f, col in zip(row_ind, col_ind) if col < R]
+
+        # N-scan-back pruning; the surviving tree is renormalised to the selected leaf
+        for f, col in zip(row_ind, col_ind):
+            track, track_filter = tracks[families[f]], tracks[families[f]]['filter']
+            selected = max((b for b in branches[f] if b['column'] == col), key=lambda b: b['score'])
+            depth = len(selected['history']) - self.n_scan
+            survivors = [b for b in branches[f] if depth <= 0 or b['history'][:depth] == selected['history'][:depth]]
+            track['mht_leaves'] = [{'snapshot': b['snapshot'], 'score': b['score'] - selected['score'],
+                                    'history': b['history'][max(depth, 0):]} for b in survivors]
+            track['mht_time'] = time
+            # Buffer the chosen step like an update (or coast) so out-of-sequence replay can reproduce it
+            track_filter.oosm_buffer.append((time, Z[col][:, np.newaxis] if col < R else None,
+                                             report_covs[col] if col < R else None, track_filter.snapshot()))
+            track_filter.restore(selected['snapshot'])
+
+        print(f"MHT: {sum(len(b) for b in branches)} hypotheses over {F} track trees")
+
+        # Initiating tracks take the remaining reports by gated assignment
+        initiating = np.array([t for t, track in enumerate(tracks) if track['current_state'] != 'Firm'], dtype=int)
+        used = {col for col in col_ind if col < R}
+        free = np.array([r for r in range(R) if r not in used], dtype=int)
+        if initiating.size and free.size:
+            assigned = perform_munkres(predictions[initiating], prediction_covs[initiating], [reports[r] for r in free],
+                                       report_covs[free], kalman_filter,
+                                       None if report_dopplers is None else [report_dopplers[r] for r in free],
+                                       None if allowed is None else allowed[np.ix_(initiating, free)])
+            best_reports += [(int(initiating[row]), report) for row, report in assigned]
+
+        print("MHT Best Reports:", best_reports)
+        return best_reports
+
+
 def check_track_timeout(tracks, current_time, poss_timeout=20.0, firm_tent_timeout=50.0):
     tracks_to_remove = []
     for track_id, track in enumerate(tracks):
-        last_measurement_time = track['measurements'][-1][0][3]  # Assuming the time is at index 3
+        last_measurement_time = track['measurements'][-1][0][3]  # Histories are kept in time order, late reports included
         time_since_last_measurement = current_time - last_measurement_time
 
         if track['current_state'] == 'Poss1' and time_since_last_measurement > poss_timeout:
@@ -337,6 +1402,346 @@ def check_track_timeout(tracks, current_time, poss_timeout=20.0, firm_tent_timeo
     return tracks_to_remove
 
 
+def delete_tracks(tracks, track_ids, track_id_list, firm_ids, state_map, hit_counts, miss_counts, reason,
+                  auction=None):
+    # Remove the given track indices and release their bookkeeping. Everything except the tracks list is keyed
+    # by the stable track['track_id'], so the tracks behind a deleted one keep their state when they shift down.
+    # The auction's carried prices go too, so a new track reusing the id starts cold.
+    for index in sorted(track_ids, reverse=True):
+        track_id = tracks[index]['track_id']
+        print(f"Removing track {track_id} due to {reason}")
+        del tracks[index]
+        track_id_list[track_id]['state'] = 'free'
+        firm_ids.discard(track_id)
+        state_map.pop(track_id, None)
+        hit_counts.pop(track_id, None)
+        miss_counts.pop(track_id, None)
+        if auction is not None:
+            auction.prices.pop(track_id, None)
+
+
+def coast_tracks(tracks, scan_start, time, scan_period):
+    # Predict every live track with no report since scan_start to the time it should have been seen,
+    # one scan period after its last update (at most time), in one batch, and record the coast on the track.
+    # Tracks without a velocity estimate have nothing to predict and keep gating on their last report.
+    missed = [track for track in tracks if track['filter'].second_rep_flag
+              and track['measurements'][-1][0][3] < scan_start and track['filter'].Meas_Time < time]
+    if not missed:
+        return []
+    times = np.minimum([track['filter'].Meas_Time + scan_period for track in missed], time)
+    missed[0]['filter'].coast_filters([track['filter'] for track in missed], times)
+    for track, coast_time in zip(missed, times):
+        track.setdefault('coasted', []).append(float(coast_time))
+    print(f"Coasted {len(missed)} tracks to their missed scans")
+    return missed
+
+
+def record_update(track, entry, track_filter, in_sequence=True):
+    # Add a (report, state) entry and the filter state after it to the track's history. A late report goes in
+    # at its time and the updates its replay redid are rewritten, so the history stays in time order for
+    # smoothing and for the checks against the last report.
+    if in_sequence:
+        track['measurements'].append(entry)
+        track['Sf'].append(track_filter.Sf.copy())
+        track['Sp'].append(track_filter.Sp.copy())
+        track['Pp'].append(track_filter.Pp.copy())
+        track['Pf'].append(track_filter.Pf.copy())
+        return
+    times = [m[0][3] for m in track['measurements']]
+    index = bisect.bisect_right(times, entry[0][3])
+    # A report the replay buffer could not take leaves the filter as it was before its time
+    states = track_filter.replayed[0][1:] if track_filter.replayed else \
+        tuple(track[key][max(index - 1, 0)].copy() for key in ('Sf', 'Pf', 'Sp', 'Pp'))
+    track['measurements'].insert(index, entry)
+    for key, value in zip(('Sf', 'Pf', 'Sp', 'Pp'), states):
+        track[key].insert(index, value)
+    step = index + 1
+    for time, *states in track_filter.replayed[1:]:
+        while step < len(times) + 1 and track['measurements'][step][0][3] < time:
+            step += 1
+        if step < len(times) + 1 and track['measurements'][step][0][3] == time:
+            for key, value in zip(('Sf', 'Pf', 'Sp', 'Pp'), states):
+                track[key][step] = value
+
+
+def update_miss_masks(tracks, miss_counts, scan_start, n):
+    # Shift every track's miss bitmask (miss_counts[track id]) by one scan, setting the new bit for tracks
+    # with no report since scan_start. Returns the misses over the last n scans for each track.
+    if not tracks:
+        return np.zeros(0, dtype=np.int64)
+    ids = [track['track_id'] for track in tracks]
+    last_times = np.array([track['measurements'][-1][0][3] for track in tracks])
+    masks = np.array([miss_counts.get(track_id, 0) for track_id in ids], dtype=np.int64)
+    masks = ((masks << 1) | (last_times < scan_start)) & ((1 << n) - 1)
+    miss_counts.update(zip(ids, masks.tolist()))
+    return sum((masks >> k) & 1 for k in range(n))
+
+
+def find_duplicate_tracks(tracks, time, cell_size=500.0, probability=0.99):
+    # Tracks locked onto the same target. Predicted positions are hashed into a grid of cell_size
+    # and only tracks in the same or neighbouring cells are compared, with the track-to-track distance
+    # d^T (P_i + P_j)^-1 d over position and velocity. Returns the indices of the redundant tracks:
+    # of each duplicate pair the Firm / longer-lived track is kept.
+    candidates = [i for i, track in enumerate(tracks)
+                  if track['current_state'] != 'Poss1' and track['filter'].second_rep_flag]
+    if len(candidates) < 2:
+        return []
+
+    kernel = tracks[candidates[0]]['filter']
+    Sp, Pp = kernel.predict_filters([tracks[i]['filter'] for i in candidates], time)
+    states = Sp[:, :6, 0]
+    covs = Pp[:, :6, :6]
+
+    grid = {}
+    for k, cell in enumerate(map(tuple, np.floor(states[:, :3] / cell_size).astype(int))):
+        grid.setdefault(cell, []).append(k)
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+    pairs = set()
+    for (cx, cy, cz), members in grid.items():
+        for dx, dy, dz in offsets:
+            for k in members:
+                for other in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                    if k < other:
+                        pairs.add((k, other))
+    if not pairs:
+        return []
+
+    pairs = np.array(sorted(pairs))
+    d = states[pairs[:, 0]] - states[pairs[:, 1]]
+    S = covs[pairs[:, 0]] + covs[pairs[:, 1]]
+    distances = np.einsum('ki,ki->k', d, np.linalg.solve(S, d[..., np.newaxis])[..., 0])
+    threshold = chi2.ppf(probability, 6)
+
+    ranks = [(tracks[i]['current_state'] == 'Firm', len(tracks[i]['measurements'])) for i in candidates]
+    redundant = set()
+    for k, other in pairs[distances < threshold]:
+        if k in redundant or other in redundant:
+            continue
+        redundant.add(other if ranks[k] >= ranks[other] else k)
+    return sorted(candidates[k] for k in redundant)
+
+
+def rts_backward_pass(Sf, Pf, Sp, Pp, Phi, mask):
+    # Rauch-Tung-Striebel backward recursion over padded stacks of tracks.
+    # Sf/Sp (T, N, n, 1), Pf/Pp (T, N, n, n), Phi[k] maps step k to k+1, mask (T, N) marks valid steps.
+    Ss = Sf.copy()
+    Ps = Pf.copy()
+    for k in range(Sf.shape[0] - 2, -1, -1):
+        valid = (mask[k] & mask[k + 1])[:, np.newaxis, np.newaxis]
+        # A = Pf Phi^T Pp^-1, using the symmetry of Pf and Pp to avoid an explicit inverse
+        A = np.swapaxes(np.linalg.solve(Pp[k + 1], Phi[k] @ Pf[k]), -1, -2)
+        Ss_k = Sf[k] + A @ (Ss[k + 1] - Sp[k + 1])
+        Ps_k = Pf[k] + A @ (Ps[k + 1] - Pp[k + 1]) @ np.swapaxes(A, -1, -2)
+        Ss[k] = np.where(valid, Ss_k, Sf[k])
+        Ps[k] = np.where(valid, Ps_k, Pf[k])
+    return Ss, Ps
+
+
+def rts_smooth_tracks(tracks, kalman_filter):
+    # Offline smoothing of the Firm segment of every track returned by main().
+    # Tracks are padded to a common length so the backward pass runs once over all of them.
+    segments = []
+    for track in tracks:
+        states = [s for _, s in track['measurements']]
+        if 'Firm' not in states:
+            track['Ss'] = [sf.copy() for sf in track['Sf']]
+            track['Ps'] = [pf.copy() for pf in track['Pf']]
+            continue
+        start = max(states.index('Firm') - 1, 0)  # Include the initiation state the first Firm update predicted from
+        segments.append((track, start))
+
+    if not segments:
+        return tracks
+
+    n = segments[0][0]['Sf'][0].shape[0]
+    dtype = segments[0][0]['Sf'][0].dtype
+    T = max(len(track['Sf']) - start for track, start in segments)
+    N = len(segments)
+    Sf = np.zeros((T, N, n, 1), dtype=dtype)
+    Sp = np.zeros((T, N, n, 1), dtype=dtype)
+    Pf = np.tile(np.eye(n, dtype=dtype), (T, N, 1, 1))
+    Pp = np.tile(np.eye(n, dtype=dtype), (T, N, 1, 1))
+    times = np.zeros((T, N))
+    mask = np.zeros((T, N), dtype=bool)
+    for j, (track, start) in enumerate(segments):
+        L = len(track['Sf']) - start
+        Sf[:L, j] = np.array(track['Sf'][start:])
+        Sp[:L, j] = np.array(track['Sp'][start:])
+        Pf[:L, j] = np.array(track['Pf'][start:])
+        Pp[:L, j] = np.array(track['Pp'][start:])
+        times[:L, j] = [m[0][3] for m in track['measurements'][start:]]
+        mask[:L, j] = True
+
+    # Transition from each step to the next; padded steps get dt = 0
+    dt = np.where(mask[1:], times[1:] - times[:-1], 0.0)
+    Phi = np.tile(np.eye(n, dtype=dtype), (T, N, 1, 1))
+    for k in range(T - 1):
+        Phi[k] = kalman_filter.transition_matrices(dt[k], Sf[k])[0]
+
+    Ss, Ps = rts_backward_pass(Sf, Pf, Sp, Pp, Phi, mask)
+
+    for j, (track, start) in enumerate(segments):
+        L = len(track['Sf']) - start
+        track['Ss'] = [sf.copy() for sf in track['Sf'][:start]] + list(Ss[:L, j])
+        track['Ps'] = [pf.copy() for pf in track['Pf'][:start]] + list(Ps[:L, j])
+    return tracks
+
+
+class FixedLagSmoother:
+    # Fixed-lag smoothing for the live tracker. Each track keeps a ring buffer of its
+    # last lag+1 filter steps; once full, every new update emits the smoothed
+    # estimate for the step lag updates back. Cost per scan is O(lag) per updated
+    # track and does not grow with track lifetime.
+    def __init__(self, lag, kalman_filter):
+        self.lag = lag
+        self.kalman_filter = kalman_filter
+
+    def push(self, track, time, track_filter):
+        buffer = track.setdefault('lag_buffer', deque(maxlen=self.lag + 1))
+        buffer.append((time, track_filter.Sf.copy(), track_filter.Pf.copy(), track_filter.Sp.copy(), track_filter.Pp.copy()))
+
+    def emit(self, tracks):
+        # One backward pass over all tracks with a full buffer; results go to track['fixed_lag']
+        ready = [track for track in tracks if len(track.get('lag_buffer', ())) == self.lag + 1]
+        if not ready:
+            return []
+
+        times = np.array([[step[0] for step in track['lag_buffer']] for track in ready]).T  # (L+1, N)
+        Sf, Pf, Sp, Pp = (np.stack([np.array([step[i] for step in track['lag_buffer']]) for track in ready], axis=1)
+                          for i in range(1, 5))
+        n = Sf.shape[-2]
+        Phi = np.tile(np.eye(n, dtype=Sf.dtype), (self.lag + 1, len(ready), 1, 1))
+        for k in range(self.lag):
+            Phi[k] = self.kalman_filter.transition_matrices(times[k + 1] - times[k], Sf[k])[0]
+        mask = np.ones(times.shape, dtype=bool)
+        Ss, Ps = rts_backward_pass(Sf, Pf, Sp, Pp, Phi, mask)
+
+        results = []
+        for j, track in enumerate(ready):
+            track.setdefault('fixed_lag', []).append((times[0, j], Ss[0, j], Ps[0, j]))
+            results.append((track, times[0, j], Ss[0, j]))
+        return results
+
+
+class ClutterMap:
+    # Persistent clutter density over a range x azimuth grid. Every report that fails to associate adds
+    # a hit to its cell and all cells decay exponentially with time, so fixed clutter (buildings,
+    # terrain) keeps its cells hot while moving targets only pass through. Warm cells make new tracks
+    # need extra hits before they progress; hot cells block initiation outright.
+    def __init__(self, max_range=100000.0, range_bin=500.0, azimuth_bin=2.0, half_life=60.0,
+                 raise_density=1.5, block_density=4.0, extra_hits=1):
+        self.range_bin = range_bin  # Cell size in range (m)
+        self.azimuth_bin = azimuth_bin  # Cell size in azimuth (deg)
+        self.half_life = half_life  # Time for a cell's density to halve (s)
+        self.raise_density = raise_density
+        self.block_density = block_density
+        self.extra_hits = extra_hits
+        self.density = np.zeros((int(np.ceil(max_range / range_bin)), int(np.ceil(360.0 / azimuth_bin))))
+        self.last_time = None
+
+    def cells(self, measurements):
+        # Grid indices of (range, azimuth, ...) reports; ranges beyond the map fall into the last ring
+        polar = np.asarray([m[:2] for m in measurements], dtype=float).reshape(-1, 2)
+        range_idx = np.clip((polar[:, 0] // self.range_bin).astype(int), 0, self.density.shape[0] - 1)
+        azimuth_idx = (np.mod(polar[:, 1], 360.0) // self.azimuth_bin).astype(int) % self.density.shape[1]
+        return range_idx, azimuth_idx
+
+    def decay(self, time):
+        # A saved map starts a new recording whose clock may restart, so time never runs backwards here
+        if self.last_time is not None and time > self.last_time:
+            self.density *= 0.5 ** ((time - self.last_time) / self.half_life)
+        self.last_time = time
+
+    def observe(self, measurements, time):
+        # Decide initiation for a scan's unassociated reports, then add them to the map.
+        # Returns (blocked, extra_hits) per report.
+        self.decay(time)
+        range_idx, azimuth_idx = self.cells(measurements)
+        density = self.density[range_idx, azimuth_idx]
+        blocked = density >= self.block_density
+        extra_hits = np.where(density >= self.raise_density, self.extra_hits, 0)
+        np.add.at(self.density, (range_idx, azimuth_idx), 1.0)
+        return blocked, extra_hits
+
+    def save(self, path):
+        with open(path, 'wb') as file:  # Through a handle so numpy keeps the path as given
+            np.savez(file, density=self.density, range_bin=self.range_bin, azimuth_bin=self.azimuth_bin,
+                     half_life=self.half_life, raise_density=self.raise_density, block_density=self.block_density,
+                     extra_hits=self.extra_hits, last_time=np.nan if self.last_time is None else self.last_time)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        clutter_map = cls(range_bin=float(data['range_bin']), azimuth_bin=float(data['azimuth_bin']),
+                          half_life=float(data['half_life']), raise_density=float(data['raise_density']),
+                          block_density=float(data['block_density']), extra_hits=int(data['extra_hits']))
+        clutter_map.density = data['density'].copy()
+        last_time = float(data['last_time'])
+        clutter_map.last_time = None if np.isnan(last_time) else last_time
+        return clutter_map
+
+
+def initiation_hits(clutter_map, measurements, time):
+    # Starting hit count for a new track on each report: 1 normally, lower in warm clutter cells,
+    # None where the clutter map blocks initiation
+    if clutter_map is None or not measurements:
+        return [1] * len(measurements)
+    blocked, extra_hits = clutter_map.observe(measurements, time)
+    for measurement, is_blocked in zip(measurements, blocked):
+        if is_blocked:
+            print(f"Initiation blocked by clutter map at range {measurement[0]}, azimuth {measurement[1]}")
+    return [None if is_blocked else 1 - int(extra) for is_blocked, extra in zip(blocked, extra_hits)]
+
+
+class ScanBudget:
+    # Per-scan latency budget with staged degradation. A scan starts at the stage implied by the previous
+    # scan's load (elapsed / deadline above 0.5, 0.8, 1.0 gives stages 1, 2, 3, stepping down at most one
+    # stage per scan) and checkpoints inside the scan raise it once the deadline is at risk.
+    #   1: JPDA clusters above max_cluster_pairs get one gated assignment instead of hypothesis scoring
+    #   2: the scan is associated with Munkres instead of the selected method
+    #   3: no new tracks are started from this scan's unassigned reports
+    stage_names = {1: 'cluster size capped', 2: 'association switched to Munkres', 3: 'initiation deferred'}
+    stage_loads = (0.5, 0.8, 1.0)
+
+    def __init__(self, deadline, max_cluster_pairs=64):
+        self.deadline = deadline
+        self.max_cluster_pairs = max_cluster_pairs
+        self.stage = 0
+        self.started = None
+        self.last_load = 0.0
+        self.scans = 0
+        self.degraded = []  # (scan index, time, stage, elapsed)
+
+    def start(self):
+        load_stage = sum(self.last_load > load for load in self.stage_loads)
+        self.stage = max(load_stage, self.stage - 1)
+        self.started = perf_counter()
+
+    def elapsed(self):
+        return perf_counter() - self.started
+
+    def checkpoint(self, fraction, stage):
+        # Raise the scan to stage when more than fraction of the deadline is already spent
+        if self.elapsed() > fraction * self.deadline:
+            self.stage = max(self.stage, stage)
+        return self.stage
+
+    def finish(self, scan_index, time):
+        elapsed = self.elapsed()
+        self.last_load = elapsed / self.deadline
+        self.scans += 1
+        if self.stage > 0 or elapsed > self.deadline:
+            self.degraded.append((scan_index, time, self.stage, elapsed))
+            actions = ', '.join(self.stage_names[s] for s in range(1, self.stage + 1)) or 'no degradation'
+            print(f"Scan {scan_index + 1} at time {time}: {elapsed * 1000:.1f} ms of {self.deadline * 1000:.1f} ms "
+                  f"budget, stage {self.stage} ({actions})")
+
+    def report(self):
+        overruns = sum(elapsed > self.deadline for _, _, _, elapsed in self.degraded)
+        print(f"Scan budget: {len(self.degraded)} of {self.scans} scans degraded or late, {overruns} over the deadline")
+        return self.degraded
+
+
 def plot_measurements(tracks, ax, plot_type, selected_track_ids=None):
     ax.clear()
     for track in tracks:
@@ -395,8 +1800,111 @@ def log_to_csv(log_file_path, data):
         writer.writerow(data)
 
 
-def main(input_file, track_mode, filter_option, association_type):
-    log_file_path = 'detailed_log.csv'
+class StageQueue:
+    # Bounded queue between two stages of the pipelined main(). put() blocks while the queue is full, so a
+    # producer that runs ahead waits for its consumer (backpressure). The depth is sampled on every put, and the
+    # time spent blocked on either side shows which stage limits the pipeline.
+    def __init__(self, name, maxsize):
+        self.name = name
+        self.queue = queue.Queue(maxsize)
+        self.maxsize = maxsize
+        self.items = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.producer_blocked = 0.0  # Seconds the producer waited on a full queue
+        self.consumer_waited = 0.0  # Seconds the consumer waited on an empty queue
+        self.finished = False  # The consumer has seen the end of stream
+
+    def put(self, item):
+        depth = self.queue.qsize()
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.items += 1
+        start = perf_counter()
+        self.queue.put(item)
+        self.producer_blocked += perf_counter() - start
+
+    def close(self):
+        self.queue.put(None)  # End of stream
+
+    def __iter__(self):
+        while True:
+            start = perf_counter()
+            item = self.queue.get()
+            self.consumer_waited += perf_counter() - start
+            if item is None:
+                self.finished = True
+                return
+            yield item
+
+    def drain(self):
+        # Discard the rest of the stream so a producer blocked on a full queue can run to its end
+        if not self.finished:
+            for _ in self:
+                pass
+
+    def report(self):
+        mean_depth = self.depth_total / self.items if self.items else 0.0
+        print(f"{self.name} queue: {self.items} items, mean depth {mean_depth:.1f}, max depth {self.max_depth} of "
+              f"{self.maxsize}, producer blocked {self.producer_blocked:.3f} s, consumer waited {self.consumer_waited:.3f} s")
+
+
+class PipelineStage(threading.Thread):
+    # One stage of the pipelined main() in a daemon thread. The stage always closes its output queue and, if it
+    # fails, keeps draining its input queue so a neighbouring stage never blocks; the error is re-raised by main().
+    def __init__(self, name, stage, args, output=None, source=None):
+        super().__init__(name=name, daemon=True)
+        self.stage = stage
+        self.args = args
+        self.output = output
+        self.source = source
+        self.error = None
+
+    def run(self):
+        try:
+            self.stage(*self.args)
+        except BaseException as error:
+            self.error = error
+            if self.source is not None:
+                self.source.drain()
+        finally:
+            if self.output is not None:
+                self.output.close()
+
+
+def prefilter_chunks(measurements, config_data, chunk_size=256):
+    # Streaming pre-filter: the limits are tested on chunks of reports so the checks stay vectorised
+    chunk = []
+    for measurement in measurements:
+        chunk.append(measurement)
+        if len(chunk) == chunk_size:
+            yield from prefilter_measurements(chunk, config_data)
+            chunk = []
+    yield from prefilter_measurements(chunk, config_data)
+
+
+def read_groups_stage(input_file, measurements, config_data, group_queue):
+    # Reader stage: parse, pre-filter and group the recording, handing each group to the tracker once it is complete
+    source = iter_measurements_from_csv(input_file) if measurements is None else measurements
+    if config_data is not None:
+        source = prefilter_chunks(source, config_data)
+    for group in iter_measurement_groups(source, max_time_diff=0.050):
+        group_queue.put(group)
+
+
+def write_log_stage(log_file_path, log_queue):
+    # Writer stage: append the detailed-log rows through one open file instead of reopening it for every row
+    with open(log_file_path, 'a', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        for data in log_queue:
+            writer.writerow(data.values())
+
+
+def main(input_file, track_mode, filter_option, association_type, steady_state_gain=False, precision='float64',
+         smoothing_lag=0, use_doppler=False, measurement_sigmas=None, config_data=None, clutter_map_file=None,
+         merge_interval=None, miss_rule=None, scan_period=None, coasting=False, n_scan=3, max_hypotheses=10,
+         cluster_workers=0, scan_deadline=None, measurements=None, log_file_path='detailed_log.csv',
+         summary_file_path='track_summary.csv', pipeline=False, queue_size=64):
 
     # Initialize CSV log file
     with open(log_file_path, 'w', newline='') as csvfile:
@@ -408,16 +1916,66 @@ def main(input_file, track_mode, filter_option, association_type):
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
 
-    measurements = read_measurements_from_csv(input_file)
-
-    if filter_option == "CV":
-        kalman_filter = CVFilter()
-    elif filter_option == "CA":
-        kalman_filter = CAFilter()
+    if measurements is None and not pipeline:
+        measurements = read_measurements_from_csv(input_file)
+
+    # Operator limits from the System Configuration dialog
+    speed_window = None
+    plant_noise = None
+    if config_data is not None:
+        if not pipeline:  # The pipeline's reader stage filters the stream itself
+            measurements = prefilter_measurements(measurements, config_data)
+        speed_window = config_data['target_speed']
+        plant_noise = config_data['plant_noise']
+        # Explicit arguments win; the dialog only fills in what the caller left unset
+        if miss_rule is None:
+            miss_rule = config_data.get('miss_rule')
+        if scan_period is None:
+            scan_period = config_data.get('scan_period')
+        if not pipeline and not measurements:
+            print("No measurements inside the configured limits.")
+            return []
+
+    if scan_period is None:
+        scan_period = 1.0
+
+    # Filter bank precision: float32 halves the memory traffic on states and covariances
+    if precision not in ('float64', 'float32'):
+        raise ValueError("Invalid precision selected.")
+    filter_dtype = np.dtype(precision)
+
+    # Reference filter for gating; every track owns its own filter instance
+    kalman_filter = create_filter(filter_option, steady_state_gain, filter_dtype, measurement_sigmas, plant_noise)
+
+    if pipeline:
+        # Pipelined mode: reading and log writing run in their own threads behind bounded queues
+        group_queue = StageQueue('Reader -> tracker', queue_size)
+        log_queue = StageQueue('Tracker -> writer', queue_size)
+        reader = PipelineStage('reader', read_groups_stage, (input_file, measurements, config_data, group_queue),
+                               output=group_queue)
+        writer = PipelineStage('writer', write_log_stage, (log_file_path, log_queue), source=log_queue)
+        measurement_groups = group_queue
+        write_log = log_queue.put
     else:
-        raise ValueError("Invalid filter option selected.")
-
-    measurement_groups = form_measurement_groups(measurements, max_time_diff=0.050)
+        measurement_groups = form_measurement_groups(measurements, max_time_diff=0.050)
+        write_log = lambda data: log_to_csv(log_file_path, data)
+
+    # Clutter map carried between runs in clutter_map_file (optional)
+    clutter_map = None
+    if clutter_map_file is not None:
+        clutter_map = ClutterMap.load(clutter_map_file) if os.path.exists(clutter_map_file) else ClutterMap()
+
+    # Optional fixed-lag smoothing stage on top of the filter
+    fixed_lag_smoother = FixedLagSmoother(smoothing_lag, kalman_filter) if smoothing_lag > 0 else None
+
+    # Hypothesis trees for the MHT association mode
+    mht = MultipleHypothesisTracker(n_scan, max_hypotheses) if association_type == 'MHT' else None
+    # Prices carried between scans by the auction assignment mode
+    auction = AuctionAssigner() if association_type == 'Auction' else None
+    # Thread pool for large JPDA clusters (optional)
+    cluster_executor = ThreadPoolExecutor(cluster_workers) if cluster_workers > 0 and association_type == 'JPDA' else None
+    # Per-scan latency budget in seconds (optional)
+    scan_budget = ScanBudget(scan_deadline) if scan_deadline is not None else None
 
     tracks = []
     track_id_list = []
@@ -426,7 +1984,7 @@ def main(input_file, track_mode, filter_option, association_type):
     doppler_threshold = 100
     range_threshold = 100
     firm_threshold = select_initiation_mode(track_mode)
-    association_method = association_type  # 'JPDA' or 'Munkres'
+    association_method = association_type  # 'JPDA', 'Munkres', 'Auction' or 'MHT'
 
     # Initialize variables outside the loop
     miss_counts = {}
@@ -442,174 +2000,101 @@ def main(input_file, track_mode, filter_option, association_type):
 
     last_check_time = 0
     check_interval = 0.0005  # 0.5 ms
-
-    for group_idx, group in enumerate(measurement_groups):
-        print(f"Processing measurement group {group_idx + 1}...")
-
-        current_time = group[0][3]  # Assuming the time is at index 3 of each measurement
-
-        # Periodic checking
-        if current_time - last_check_time >= check_interval:
-            tracks_to_remove = check_track_timeout(tracks, current_time)
-            for track_id in reversed(tracks_to_remove):
-                print(f"Removing track {track_id} due to timeout")
-                del tracks[track_id]
-                track_id_list[track_id]['state'] = 'free'
-                if track_id in firm_ids:
-                    firm_ids.remove(track_id)
-                if track_id in state_map:
-                    del state_map[track_id]
-                if track_id in hit_counts:
-                    del hit_counts[track_id]
-                if track_id in miss_counts:
-                    del miss_counts[track_id]
-            last_check_time = current_time
-
-        if len(group) == 1:  # Single measurement
-            measurement = group[0]
-            assigned = False
-            for track_id, track in enumerate(tracks):                
-                if correlation_check(track, measurement, doppler_threshold, range_threshold):
-                    current_state = state_map.get(track_id, None)
-                    if current_state == 'Poss1':
-                        initialize_filter_state(kalman_filter, *sph2cart(*measurement[:3]), 0, 0, 0, measurement[3])
-                    elif current_state == 'Tentative1':
-                        last_measurement = track['measurements'][-1][0]
-                        dt = measurement[3] - last_measurement[3]
-                        vx = (sph2cart(*measurement[:3])[0] - sph2cart(*last_measurement[:3])[0]) / dt
-                        vy = (sph2cart(*measurement[:3])[1] - sph2cart(*last_measurement[:3])[1]) / dt
-                        vz = (sph2cart(*measurement[:3])[2] - sph2cart(*last_measurement[:3])[2]) / dt
-                        initialize_filter_state(kalman_filter, *sph2cart(*measurement[:3]), vx, vy, vz, measurement[3])
-                    elif current_state == 'Firm':
-                        kalman_filter.predict_step(measurement[3])
-                        kalman_filter.update_step(np.array((measurement[:3])).reshape(3, 1))
-
-                    track['measurements'].append((measurement, current_state))
-                    track['Sf'].append(kalman_filter.Sf.copy())
-                    track['Sp'].append(kalman_filter.Sp.copy())
-                    track['Pp'].append(kalman_filter.Pp.copy())
-                    track['Pf'].append(kalman_filter.Pf.copy())
-                    hit_counts[track_id] = hit_counts.get(track_id, 0) + 1
-                    assigned = True
-
-                    # Log data to CSV
-                    log_data = {
-                        'Time': measurement[3],
-                        'Measurement X': measurement[5],
-                        'Measurement Y': measurement[6],
-                        'Measurement Z': measurement[7],
-                        'Current State': current_state,
-                        'Correlation Output': 'Yes',
-                        'Associated Track ID': track_id,
-                        'Associated Position X': track['Sf'][-1][0, 0],
-                        'Associated Position Y': track['Sf'][-1][1, 0],
-                        'Associated Position Z': track['Sf'][-1][2, 0],
-                        'Association Type': 'Single',
-                        'Clusters Formed': '',
-                        'Hypotheses Generated': '',
-                        'Probability of Hypothesis': '',
-                        'Best Report Selected': ''
-                    }
-                    log_to_csv(log_file_path, log_data)
-                    break
-
-            if not assigned:
-                new_track_id = next((i for i, t in enumerate(track_id_list) if t['state'] == 'free'), None)
-                if new_track_id is None:
-                    new_track_id = len(track_id_list)
-                    track_id_list.append({'id': new_track_id, 'state': 'occupied'})
-                else:
-                    track_id_list[new_track_id]['state'] = 'occupied'
-
-                tracks.append({
-                    'track_id': new_track_id,
-                    'measurements': [(measurement, 'Poss1')],
-                    'current_state': 'Poss1',
-                    'Sf': [kalman_filter.Sf.copy()],
-                    'Sp': [kalman_filter.Sp.copy()],
-                    'Pp': [kalman_filter.Pp.copy()],
-                    'Pf': [kalman_filter.Pf.copy()]
-                })
-                state_map[new_track_id] = 'Poss1'
-                state_transition_times[new_track_id] = {'Poss1': current_time}
-                hit_counts[new_track_id] = 1
-                initialize_filter_state(kalman_filter, *sph2cart(*measurement[:3]), 0, 0, 0, measurement[3])
-
-                # Log data to CSV
-                log_data = {
-                    'Time': measurement[3],
-                    'Measurement X': measurement[5],
-                    'Measurement Y': measurement[6],
-                    'Measurement Z': measurement[7],
-                    'Current State': 'Poss1',
-                    'Correlation Output': 'No',
-                    'Associated Track ID': new_track_id,
-                    'Associated Position X': '',
-                    'Associated Position Y': '',
-                    'Associated Position Z': '',
-                    'Association Type': 'New',
-                    'Clusters Formed': '',
-                    'Hypotheses Generated': '',
-                    'Probability of Hypothesis': '',
-                    'Best Report Selected': ''
-                }
-                log_to_csv(log_file_path, log_data)
-
-        else:  # Multiple measurements
-            reports = [sph2cart(*m[:3]) for m in group]
-            if association_method == 'JPDA':
-                clusters, best_reports, hypotheses, probabilities = perform_jpda(
-                    [track['measurements'][-1][0][:3] for track in tracks], reports, kalman_filter
-                )
-            elif association_method == 'Munkres':
-                best_reports = perform_munkres([track['measurements'][-1][0][:3] for track in tracks], reports, kalman_filter)
-
-            for track_id, best_report in best_reports:
-                print("check the best reports",)
-                current_state = state_map.get(track_id, None)
-                if current_state == 'Poss1':
-                    initialize_filter_state(kalman_filter, *best_report, vx, vy, vz, group[0][3])
-                elif current_state == 'Tentative1':
-                    last_measurement = tracks[track_id]['measurements'][-1][0]
-                    dt = group[0][3] - last_measurement[3]
-                    vx = (best_report[0] - sph2cart(*last_measurement[:3])[0]) / dt
-                    vy = (best_report[1] - sph2cart(*last_measurement[:3])[1]) / dt
-                    vz = (best_report[2] - sph2cart(*last_measurement[:3])[2]) / dt
-                    initialize_filter_state(kalman_filter, *best_report, vx, vy, vz, group[0][3])
-                elif current_state == 'Firm':
-                    kalman_filter.predict_step(group[0][3])
-                    kalman_filter.update_step(np.array(best_report).reshape(3, 1))
-
-                tracks[track_id]['measurements'].append((cart2sph(*best_report) + (group[0][3], group[0][4]), current_state))
-                tracks[track_id]['Sf'].append(kalman_filter.Sf.copy())
-                tracks[track_id]['Sp'].append(kalman_filter.Sp.copy())
-                tracks[track_id]['Pp'].append(kalman_filter.Pp.copy())
-                tracks[track_id]['Pf'].append(kalman_filter.Pf.copy())
-                hit_counts[track_id] = hit_counts.get(track_id, 0) + 1
-
-                # Log data to CSV
-                log_data = {
-                    'Time': group[0][3],
-                    'Measurement X': best_report[0],
-                    'Measurement Y': best_report[1],
-                    'Measurement Z': best_report[2],
-                    'Current State': current_state,
-                    'Correlation Output': 'Yes',
-                    'Associated Track ID': track_id,
-                    'Associated Position X': tracks[track_id]['Sf'][-1][0, 0],
-                    'Associated Position Y': tracks[track_id]['Sf'][-1][1, 0],
-                    'Associated Position Z': tracks[track_id]['Sf'][-1][2, 0],
-                    'Association Type': association_method,
-                    'Hypotheses Generated': '',
-                    'Probability of Hypothesis': '',
-                    'Best Report Selected': best_report
-                }
-                log_to_csv(log_file_path, log_data)
-
-            # Handle unassigned measurements
-            assigned_reports = set(best_report for _, best_report in best_reports)
-            for report in reports:
-                if tuple(report) not in assigned_reports:
+    last_merge_time = 0
+    scan_start_time = None
+    latest_time = None
+
+    if pipeline:
+        reader.start()
+        writer.start()
+    try:
+        for group_idx, group in enumerate(measurement_groups):
+            print(f"Processing measurement group {group_idx + 1}...")
+
+            current_time = group[0][3]  # Assuming the time is at index 3 of each measurement
+            if scan_start_time is None:
+                scan_start_time = current_time
+            # A late group may still update tracks through replay, but it never starts one: its reports are
+            # behind every track and the next scan reports the target again
+            late_group = latest_time is not None and current_time < latest_time
+            if not late_group:
+                latest_time = current_time
+            lag_updated_tracks = []
+            if scan_budget is not None:
+                scan_budget.start()
+
+            # Periodic checking
+            if current_time - last_check_time >= check_interval:
+                tracks_to_remove = check_track_timeout(tracks, current_time)
+                delete_tracks(tracks, tracks_to_remove, track_id_list, firm_ids, state_map, hit_counts, miss_counts, 'timeout',
+                              auction)
+                last_check_time = current_time
+
+            # Periodic duplicate-track merge (optional)
+            if merge_interval is not None and current_time - last_merge_time >= merge_interval:
+                duplicates = find_duplicate_tracks(tracks, current_time)
+                delete_tracks(tracks, duplicates, track_id_list, firm_ids, state_map, hit_counts, miss_counts, 'duplicate',
+                              auction)
+                last_merge_time = current_time
+
+            # Scan boundary: coast the tracks that missed the scan and apply M-of-N deletion (both optional)
+            if current_time - scan_start_time >= scan_period:
+                if coasting:
+                    coast_tracks(tracks, scan_start_time, current_time, scan_period)
+                if miss_rule is not None:
+                    miss_totals = update_miss_masks(tracks, miss_counts, scan_start_time, miss_rule[1])
+                    delete_tracks(tracks, np.flatnonzero(miss_totals >= miss_rule[0]).tolist(), track_id_list, firm_ids,
+                                  state_map, hit_counts, miss_counts, f"{miss_rule[0]}-of-{miss_rule[1]} misses", auction)
+                # Whole periods, so the scan clock does not drift with the time of each scan's first report
+                scan_start_time += scan_period * np.floor((current_time - scan_start_time) / scan_period)
+
+            if len(group) == 1:  # Single measurement
+                measurement = group[0]
+                assigned = False
+                speed_allowed = initiation_speed_mask(tracks, [measurement_to_cart(measurement)], measurement[3], speed_window)[:, 0]
+                for track_id, track in enumerate(tracks):                
+                    if speed_allowed[track_id] and correlation_check(track, measurement, doppler_threshold, range_threshold, use_doppler):
+                        current_state = state_map.get(track['track_id'], None)
+                        track_filter = track['filter']
+                        in_sequence = True
+                        if current_state not in (None, 'Firm'):
+                            # Initiation report: refit position and velocity over all of the track's reports
+                            initiate_tracks([(track, measurement)])
+                        elif current_state == 'Firm':
+                            R = track_filter.measurement_covariances([measurement], use_doppler)[0] if track_filter.polar_noise else None
+                            in_sequence = track_filter.process_measurement(measurement_vector(measurement, use_doppler), measurement[3], R)
+                            if fixed_lag_smoother is not None and in_sequence:
+                                fixed_lag_smoother.push(track, measurement[3], track_filter)
+                                lag_updated_tracks.append(track)
+
+                        record_update(track, (measurement, current_state), track_filter, in_sequence)
+                        hit_counts[track['track_id']] = hit_counts.get(track['track_id'], 0) + 1
+                        assigned = True
+
+                        # Log data to CSV
+                        log_data = {
+                            'Time': measurement[3],
+                            'Measurement X': measurement[5],
+                            'Measurement Y': measurement[6],
+                            'Measurement Z': measurement[7],
+                            'Current State': current_state,
+                            'Correlation Output': 'Yes',
+                            'Associated Track ID': track['track_id'],
+                            'Associated Position X': track['Sf'][-1][0, 0],
+                            'Associated Position Y': track['Sf'][-1][1, 0],
+                            'Associated Position Z': track['Sf'][-1][2, 0],
+                            'Association Type': 'Single',
+                            'Clusters Formed': '',
+                            'Hypotheses Generated': '',
+                            'Probability of Hypothesis': '',
+                            'Best Report Selected': ''
+                        }
+                        write_log(log_data)
+                        break
+
+                deferred = scan_budget is not None and scan_budget.checkpoint(1.0, 3) >= 3
+                start_hits = None if assigned or deferred or late_group else initiation_hits(clutter_map, [measurement], measurement[3])[0]
+                if start_hits is not None:
                     new_track_id = next((i for i, t in enumerate(track_id_list) if t['state'] == 'free'), None)
                     if new_track_id is None:
                         new_track_id = len(track_id_list)
@@ -617,26 +2102,28 @@ def main(input_file, track_mode, filter_option, association_type):
                     else:
                         track_id_list[new_track_id]['state'] = 'occupied'
 
+                    track_filter = create_filter(filter_option, steady_state_gain, filter_dtype, measurement_sigmas, plant_noise)
+                    initialize_filter_state(track_filter, *measurement_to_cart(measurement), 0, 0, 0, measurement[3])
                     tracks.append({
                         'track_id': new_track_id,
-                        'measurements': [(cart2sph(*report) + (group[0][3], group[0][4]), 'Poss1')],
+                        'measurements': [(measurement, 'Poss1')],
                         'current_state': 'Poss1',
-                        'Sf': [kalman_filter.Sf.copy()],
-                        'Sp': [kalman_filter.Sp.copy()],
-                        'Pp': [kalman_filter.Pp.copy()],
-                        'Pf': [kalman_filter.Pf.copy()]
+                        'filter': track_filter,
+                        'Sf': [track_filter.Sf.copy()],
+                        'Sp': [track_filter.Sp.copy()],
+                        'Pp': [track_filter.Pp.copy()],
+                        'Pf': [track_filter.Pf.copy()]
                     })
                     state_map[new_track_id] = 'Poss1'
                     state_transition_times[new_track_id] = {'Poss1': current_time}
-                    hit_counts[new_track_id] = 1
-                    initialize_filter_state(kalman_filter, *report, 0, 0, 0, group[0][3])
+                    hit_counts[new_track_id] = start_hits
 
                     # Log data to CSV
                     log_data = {
-                        'Time': group[0][3],
-                        'Measurement X': report[0],
-                        'Measurement Y': report[1],
-                        'Measurement Z': report[2],
+                        'Time': measurement[3],
+                        'Measurement X': measurement[5],
+                        'Measurement Y': measurement[6],
+                        'Measurement Z': measurement[7],
                         'Current State': 'Poss1',
                         'Correlation Output': 'No',
                         'Associated Track ID': new_track_id,
@@ -644,31 +2131,198 @@ def main(input_file, track_mode, filter_option, association_type):
                         'Associated Position Y': '',
                         'Associated Position Z': '',
                         'Association Type': 'New',
+                        'Clusters Formed': '',
                         'Hypotheses Generated': '',
                         'Probability of Hypothesis': '',
                         'Best Report Selected': ''
                     }
-                    log_to_csv(log_file_path, log_data)
-
-        # Update states based on hit counts
-        for track_id, track in enumerate(tracks):
-            current_state = state_map.get(track_id,None)
-            if current_state is not None:
-                current_state_index = progression_states.index(current_state)
-                if hit_counts[track_id] >= firm_threshold and current_state != 'Firm':
-                    state_map[track_id] = 'Firm'
-                    firm_ids.add(track_id)
-                    state_transition_times.setdefault(track_id, {})['Firm'] = current_time
-                elif current_state_index < len(progression_states) - 1:
-                    next_state = progression_states[current_state_index + 1]
-                    if hit_counts[track_id] >= current_state_index + 1 and state_map[track_id] != next_state:
-                        state_map[track_id] = next_state
-                        state_transition_times.setdefault(track_id, {})[next_state] = current_time
-                track['current_state'] = state_map[track_id]
+                    write_log(log_data)
+
+            else:  # Multiple measurements
+                reports = [measurement_to_cart(m) for m in group]
+                # Gate against each track's prediction at the scan time (position + doppler when enabled)
+                predictions, prediction_covs = predict_track_measurements(tracks, group[0][3], kalman_filter, use_doppler)
+                report_dopplers = [m[4] for m in group] if use_doppler else None
+                # Noise of every report in the scan, computed in one batch
+                report_covs = kalman_filter.measurement_covariances(group, use_doppler)
+                # Initiating tracks may only take reports at a plausible target speed
+                allowed = initiation_speed_mask(tracks, reports, group[0][3], speed_window)
+                # Under a latency budget the scan may be associated more cheaply than the selected method
+                scan_method = association_method
+                max_cluster_pairs = None
+                if scan_budget is not None:
+                    stage = scan_budget.checkpoint(0.5, 2)  # Prediction and gating alone used half the budget
+                    if stage >= 2:
+                        scan_method = 'Munkres'
+                    elif stage == 1:
+                        max_cluster_pairs = scan_budget.max_cluster_pairs
+                if scan_method == 'JPDA':
+                    clusters, best_reports, hypotheses, probabilities = perform_jpda(
+                        predictions, prediction_covs, reports, report_covs, kalman_filter, report_dopplers, allowed,
+                        cluster_executor, max_cluster_pairs=max_cluster_pairs
+                    )
+                elif scan_method == 'Munkres':
+                    best_reports = perform_munkres(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                                   report_dopplers, allowed)
+                elif scan_method == 'Auction':
+                    best_reports = perform_auction(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                                   report_dopplers, allowed, auction, [track['track_id'] for track in tracks])
+                elif scan_method == 'MHT':
+                    best_reports = mht.associate(tracks, reports, predictions, prediction_covs, report_covs, kalman_filter,
+                                                 group[0][3], report_dopplers, allowed)
+
+                # Seed every initiating track of this scan in one batch
+                initiate_tracks([(tracks[track_id], group[reports.index(best_report)]) for track_id, best_report in best_reports
+                                 if state_map.get(tracks[track_id]['track_id'], None) not in (None, 'Firm')])
+
+                for track_id, best_report in best_reports:
+                    print("check the best reports",)
+                    current_state = state_map.get(tracks[track_id]['track_id'], None)
+                    track_filter = tracks[track_id]['filter']
+                    report_index = reports.index(best_report)
+                    in_sequence = True
+                    if current_state == 'Firm':
+                        Z = np.array(best_report).reshape(3, 1)
+                        if use_doppler:
+                            Z = np.vstack([Z, [[group[report_index][4]]]])
+                        R = report_covs[report_index] if kalman_filter.polar_noise else None
+                        if scan_method == 'MHT':
+                            in_sequence = True  # The filter already holds its selected hypothesis
+                        else:
+                            in_sequence = track_filter.process_measurement(Z, group[0][3], R)
+                        if fixed_lag_smoother is not None and in_sequence:
+                            fixed_lag_smoother.push(tracks[track_id], group[0][3], track_filter)
+                            lag_updated_tracks.append(tracks[track_id])
+
+                    record_update(tracks[track_id], (cart2sph(*best_report) + (group[0][3], group[report_index][4]), current_state),
+                                  track_filter, in_sequence)
+                    hit_counts[tracks[track_id]['track_id']] = hit_counts.get(tracks[track_id]['track_id'], 0) + 1
+
+                    # Log data to CSV
+                    log_data = {
+                        'Time': group[0][3],
+                        'Measurement X': best_report[0],
+                        'Measurement Y': best_report[1],
+                        'Measurement Z': best_report[2],
+                        'Current State': current_state,
+                        'Correlation Output': 'Yes',
+                        'Associated Track ID': tracks[track_id]['track_id'],
+                        'Associated Position X': tracks[track_id]['Sf'][-1][0, 0],
+                        'Associated Position Y': tracks[track_id]['Sf'][-1][1, 0],
+                        'Associated Position Z': tracks[track_id]['Sf'][-1][2, 0],
+                        'Association Type': scan_method,
+                        'Hypotheses Generated': '',
+                        'Probability of Hypothesis': '',
+                        'Best Report Selected': best_report
+                    }
+                    write_log(log_data)
+
+                # Handle unassigned measurements
+                assigned_reports = set(best_report for _, best_report in best_reports)
+                unassigned = [i for i, report in enumerate(reports) if tuple(report) not in assigned_reports]
+                if scan_budget is not None and scan_budget.checkpoint(1.0, 3) >= 3:
+                    unassigned = []  # Initiation deferred; the targets are reported again next scan
+                if late_group:
+                    unassigned = []
+                # A report inside a Firm track's gate is a split detection of that target (the track took the better
+                # one); a track started on it would only be merged away again, so it is not initiated
+                firm_rows = [i for i, track in enumerate(tracks) if state_map.get(track['track_id']) == 'Firm']
+                if unassigned and firm_rows:
+                    distances, threshold = gating_distances(
+                        predictions[firm_rows], prediction_covs[firm_rows], [reports[i] for i in unassigned],
+                        report_covs[unassigned], kalman_filter,
+                        None if report_dopplers is None else [report_dopplers[i] for i in unassigned])
+                    unassigned = [i for i, gated in zip(unassigned, (distances < threshold).any(axis=0)) if not gated]
+                start_hits = dict(zip(unassigned, initiation_hits(clutter_map, [group[i] for i in unassigned], group[0][3])))
+                for report_index, report in enumerate(reports):
+                    if start_hits.get(report_index) is not None:
+                        new_track_id = next((i for i, t in enumerate(track_id_list) if t['state'] == 'free'), None)
+                        if new_track_id is None:
+                            new_track_id = len(track_id_list)
+                            track_id_list.append({'id': new_track_id, 'state': 'occupied'})
+                        else:
+                            track_id_list[new_track_id]['state'] = 'occupied'
+
+                        track_filter = create_filter(filter_option, steady_state_gain, filter_dtype, measurement_sigmas, plant_noise)
+                        initialize_filter_state(track_filter, *report, 0, 0, 0, group[0][3])
+                        tracks.append({
+                            'track_id': new_track_id,
+                            'measurements': [(cart2sph(*report) + (group[0][3], group[report_index][4]), 'Poss1')],
+                            'current_state': 'Poss1',
+                            'filter': track_filter,
+                            'Sf': [track_filter.Sf.copy()],
+                            'Sp': [track_filter.Sp.copy()],
+                            'Pp': [track_filter.Pp.copy()],
+                            'Pf': [track_filter.Pf.copy()]
+                        })
+                        state_map[new_track_id] = 'Poss1'
+                        state_transition_times[new_track_id] = {'Poss1': current_time}
+                        hit_counts[new_track_id] = start_hits[report_index]
+
+                        # Log data to CSV
+                        log_data = {
+                            'Time': group[0][3],
+                            'Measurement X': report[0],
+                            'Measurement Y': report[1],
+                            'Measurement Z': report[2],
+                            'Current State': 'Poss1',
+                            'Correlation Output': 'No',
+                            'Associated Track ID': new_track_id,
+                            'Associated Position X': '',
+                            'Associated Position Y': '',
+                            'Associated Position Z': '',
+                            'Association Type': 'New',
+                            'Hypotheses Generated': '',
+                            'Probability of Hypothesis': '',
+                            'Best Report Selected': ''
+                        }
+                        write_log(log_data)
+
+            # Emit fixed-lag smoothed estimates for the tracks updated in this scan
+            if fixed_lag_smoother is not None:
+                for track, lag_time, Ss in fixed_lag_smoother.emit(lag_updated_tracks):
+                    print(f"Fixed-lag smoothed track {track['track_id']} at time {lag_time}: {Ss[:3, 0]}")
+
+            # Update states based on hit counts
+            for track in tracks:
+                track_id = track['track_id']
+                current_state = state_map.get(track_id,None)
+                if current_state is not None:
+                    current_state_index = progression_states.index(current_state)
+                    if hit_counts[track_id] >= firm_threshold and current_state != 'Firm':
+                        state_map[track_id] = 'Firm'
+                        firm_ids.add(track_id)
+                        state_transition_times.setdefault(track_id, {})['Firm'] = current_time
+                    elif current_state_index < len(progression_states) - 1:
+                        next_state = progression_states[current_state_index + 1]
+                        if hit_counts[track_id] >= current_state_index + 1 and state_map[track_id] != next_state:
+                            state_map[track_id] = next_state
+                            state_transition_times.setdefault(track_id, {})[next_state] = current_time
+                    track['current_state'] = state_map[track_id]
+
+            if scan_budget is not None:
+                scan_budget.finish(group_idx, current_time)
+    finally:
+        if pipeline:
+            # End both streams and join the stages also when the tracker raised, so no thread stays blocked
+            log_queue.close()
+            group_queue.drain()
+            reader.join()
+            writer.join()
+        if cluster_executor is not None:
+            cluster_executor.shutdown()
+
+    if pipeline:
+        for stage in (reader, writer):
+            if stage.error is not None:
+                raise stage.error
+        group_queue.report()
+        log_queue.report()
 
     # Prepare data for CSV
     csv_data = []
-    for track_id, track in enumerate(tracks):
+    for track in tracks:
+        track_id = track['track_id']
         print(f"Track {track_id}:")
         print(f"  Current State: {track['current_state']}")
         print(f"  State Transition Times:")
@@ -703,7 +2357,7 @@ def main(input_file, track_mode, filter_option, association_type):
         })
 
     # Write to CSV
-    csv_file_path = 'track_summary.csv'
+    csv_file_path = summary_file_path
     with open(csv_file_path, 'w', newline='') as csvfile:
         fieldnames = ['Track ID', 'Current State', 'Poss1 Time', 'Tentative1 Time', 'Firm Time',
                       'Poss1 Measurements', 'Tentative1 Measurements', 'Firm Measurements',
@@ -715,10 +2369,268 @@ def main(input_file, track_mode, filter_option, association_type):
 
     print(f"Track summary has been written to {csv_file_path}")
 
+    if clutter_map is not None:
+        clutter_map.save(clutter_map_file)
+        print(f"Clutter map has been written to {clutter_map_file}")
+
+    if scan_budget is not None:
+        scan_budget.report()
+
     # Add this line at the end of the function
     return tracks
 
 
+def check_float32_accuracy(input_file, track_mode, filter_option, association_type, tolerance=1.0, **kwargs):
+    # Run the reference recording in float64 and float32 and compare the filtered positions
+    # Both runs must start from the same clutter map, so the float64 run's copy is rolled back
+    clutter_map_file = kwargs.get('clutter_map_file')
+    saved_map = None
+    if clutter_map_file is not None and os.path.exists(clutter_map_file):
+        with open(clutter_map_file, 'rb') as file:
+            saved_map = file.read()
+    tracks_64 = main(input_file, track_mode, filter_option, association_type, precision='float64', **kwargs)
+    if clutter_map_file is not None:
+        if saved_map is None:
+            os.remove(clutter_map_file)
+        else:
+            with open(clutter_map_file, 'wb') as file:
+                file.write(saved_map)
+    tracks_32 = main(input_file, track_mode, filter_option, association_type, precision='float32', **kwargs)
+
+    if len(tracks_64) != len(tracks_32):
+        print(f"Warning: float32 run produced {len(tracks_32)} tracks, float64 run produced {len(tracks_64)}")
+        return tracks_32, np.inf
+
+    max_divergence = 0.0
+    for track_64, track_32 in zip(tracks_64, tracks_32):
+        if len(track_64['Sf']) != len(track_32['Sf']):
+            print(f"Warning: track {track_64['track_id']} history length differs between float64 and float32")
+            return tracks_32, np.inf
+        Sf_64 = np.array([sf[:3, 0] for sf in track_64['Sf']], dtype=np.float64)
+        Sf_32 = np.array([sf[:3, 0] for sf in track_32['Sf']], dtype=np.float64)
+        max_divergence = max(max_divergence, float(np.max(np.linalg.norm(Sf_64 - Sf_32, axis=1))))
+        # A float32 covariance with an eigenvalue below rounding level has lost definiteness and will break gating
+        Pf_32 = np.array(track_32['Pf'], dtype=np.float64)
+        eigenvalues = np.linalg.eigvalsh(0.5 * (Pf_32 + np.swapaxes(Pf_32, -1, -2)))
+        floor = -np.finfo(np.float32).eps * Pf_32.shape[-1] * np.max(np.abs(eigenvalues), axis=-1)
+        if np.any(eigenvalues[:, 0] < floor):
+            print(f"Warning: track {track_32['track_id']} float32 covariance is not positive semi-definite, use float64 for this configuration")
+            return tracks_32, np.inf
+
+    print(f"Float32 accuracy check: max position divergence {max_divergence:.6f} m (tolerance {tolerance} m)")
+    if max_divergence > tolerance:
+        print(f"Warning: float32 divergence {max_divergence:.6f} m exceeds tolerance {tolerance} m, use float64 for this configuration")
+    return tracks_32, max_divergence
+
+
+def sector_rows(azimuths, n_sectors, overlap):
+    # Row indices of each sector's measurements: its own azimuth slice plus overlap degrees on either side
+    width = 360.0 / n_sectors
+    rows = []
+    for k in range(n_sectors):
+        offset = np.mod(azimuths - k * width + overlap, 360.0)
+        rows.append(np.nonzero(offset < width + 2 * overlap)[0])
+    return rows
+
+
+def measurement_key(measurement):
+    # Identifies a report in any sector's history; the multi-target path stores it after a cart2sph round trip
+    return (round(measurement[3], 3), round(measurement[0], 1), round(measurement[1], 3))
+
+
+def run_sector_worker(shm_name, shape, rows, sector, input_file, track_mode, filter_option, association_type, kwargs):
+    # Worker process: attach to the shared measurement table, track this sector's slice with main(),
+    # smooth it inside the sector and send back the histories without the filter objects
+    sys.stdout = sys.__stdout__  # Never write to a GUI console stream from another process
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        measurements = [tuple(row) for row in table[rows].tolist()]
+    finally:
+        shm.close()
+    if not measurements:
+        return []
+    tracks = main(input_file, track_mode, filter_option, association_type, measurements=measurements,
+                  log_file_path=f'detailed_log_sector{sector}.csv',
+                  summary_file_path=f'track_summary_sector{sector}.csv', **kwargs)
+    # Smoothing runs here, on histories that do not cross a sector seam
+    rts_smooth_tracks(tracks, create_filter(filter_option))
+    return [{key: track[key] for key in ('current_state', 'measurements', 'Sf', 'Sp', 'Pf', 'Pp', 'Ss', 'Ps')}
+            for track in tracks]
+
+
+def stitch_sector_tracks(sector_tracks, n_sectors):
+    # Tracks from neighbouring sectors that hold the same report in the overlap are one target handed across
+    # the boundary. Their histories are joined in time order; where both hold a scan, the Firm track wins,
+    # then the sector that owns the report's azimuth, so the estimate passes over once the new sector is Firm.
+    width = 360.0 / n_sectors
+    nodes = [(k, i) for k, tracks in enumerate(sector_tracks) for i in range(len(tracks))]
+    parent = list(range(len(nodes)))
+
+    def find(j):
+        while parent[j] != j:
+            parent[j] = parent[parent[j]]
+            j = parent[j]
+        return j
+
+    holders = {}
+    for j, (k, i) in enumerate(nodes):
+        for measurement, _ in sector_tracks[k][i]['measurements']:
+            for other in holders.setdefault(measurement_key(measurement), []):
+                if nodes[other][0] != k:
+                    a, b = find(j), find(other)
+                    parent[max(a, b)] = min(a, b)
+            holders[measurement_key(measurement)].append(j)
+
+    families = {}
+    for j in range(len(nodes)):
+        families.setdefault(find(j), []).append(j)
+
+    merged = []
+    for members in families.values():
+        steps = {}
+        for j in members:
+            k, i = nodes[j]
+            track = sector_tracks[k][i]
+            for step, (measurement, state) in enumerate(track['measurements']):
+                owner = int(measurement[1] // width) % n_sectors
+                rank = (state != 'Firm', k != owner, k)
+                scan = round(measurement[3], 3)
+                if scan not in steps or rank < steps[scan][0]:
+                    steps[scan] = (rank, track, step)
+        history = [steps[scan][1:] for scan in sorted(steps)]
+        merged.append({
+            'current_state': history[-1][0]['current_state'],
+            'sectors': sorted({nodes[j][0] for j in members}),
+            'measurements': [track['measurements'][step] for track, step in history],
+            'Sf': [track['Sf'][step] for track, step in history],
+            'Sp': [track['Sp'][step] for track, step in history],
+            'Pf': [track['Pf'][step] for track, step in history],
+            'Pp': [track['Pp'][step] for track, step in history],
+            'Ss': [track['Ss'][step] for track, step in history],
+            'Ps': [track['Ps'][step] for track, step in history],
+        })
+
+    # Track ids follow the first report of each merged history, independent of worker timing
+    merged.sort(key=lambda track: measurement_key(track['measurements'][0][0]) + (track['sectors'][0],))
+    for track_id, track in enumerate(merged):
+        track['track_id'] = track_id
+    return merged
+
+
+def run_sectors(input_file, track_mode, filter_option, association_type, n_sectors=4, overlap=5.0, workers=None,
+                **kwargs):
+    # Azimuth-sector partitioned tracking: every sector runs main() in its own process on its slice of the
+    # recording plus an overlap margin, and the sector tracks are stitched into one list afterwards.
+    # Workers are spawned, not forked, so they start without the parent's threads, Qt state or stdout;
+    # each sector is RTS smoothed in its worker, and the stitched tracks carry those smoothed estimates.
+    # The overlap must span the distance a target covers while a track is initiated (firm_threshold scans),
+    # otherwise a crossing target has no shared reports to link its two sector tracks.
+    measurements = read_measurements_from_csv(input_file)
+    if not measurements:
+        print("No measurements in the input file.")
+        return []
+    table = np.array(measurements, dtype=np.float64)
+    rows = sector_rows(table[:, 1], n_sectors, overlap)
+
+    clutter_map_file = kwargs.pop('clutter_map_file', None)
+    shm = shared_memory.SharedMemory(create=True, size=table.nbytes)
+    try:
+        np.ndarray(table.shape, dtype=np.float64, buffer=shm.buf)[:] = table
+        with ProcessPoolExecutor(workers or n_sectors, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = []
+            for k in range(n_sectors):
+                sector_kwargs = dict(kwargs)
+                if clutter_map_file is not None:
+                    # Clutter maps are learned per sector, each worker keeps its own file
+                    root, ext = os.path.splitext(clutter_map_file)
+                    sector_kwargs['clutter_map_file'] = f'{root}_sector{k}{ext}'
+                futures.append(executor.submit(run_sector_worker, shm.name, table.shape, rows[k], k, input_file,
+                                               track_mode, filter_option, association_type, sector_kwargs))
+            sector_tracks = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    tracks = stitch_sector_tracks(sector_tracks, n_sectors)
+    for k in range(n_sectors):
+        print(f"Sector {k}: {len(rows[k])} measurements, {len(sector_tracks[k])} tracks")
+    print(f"Merged {sum(len(s) for s in sector_tracks)} sector tracks into {len(tracks)} tracks "
+          f"({sum(len(track['sectors']) > 1 for track in tracks)} handed over between sectors)")
+
+    csv_file_path = 'track_summary.csv'
+    with open(csv_file_path, 'w', newline='') as csvfile:
+        fieldnames = ['Track ID', 'Current State', 'Sectors', 'Poss1 Measurements', 'Firm Measurements',
+                      'SF', 'SP', 'PF', 'PP']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for track in tracks:
+            writer.writerow({
+                'Track ID': track['track_id'],
+                'Current State': track['current_state'],
+                'Sectors': str(track['sectors']),
+                'Poss1 Measurements': str([m for m, s in track['measurements'] if s == 'Poss1'][:3]),
+                'Firm Measurements': str([m for m, s in track['measurements'] if s == 'Firm'][:3]),
+                'SF': [sf.tolist() for sf in track['Sf']],
+                'SP': [sp.tolist() for sp in track['Sp']],
+                'PF': [pf.tolist() for pf in track['Pf']],
+                'PP': [pp.tolist() for pp in track['Pp']]
+            })
+    print(f"Track summary has been written to {csv_file_path}")
+    return tracks
+
+
+def benchmark_assignment(sizes=(25, 50, 100, 200, 400, 800), clutter_ratio=0.5, scans=4, seed=0):
+    # Time linear_sum_assignment against the auction, cold and warm-started, on synthetic scenes of growing size.
+    # Targets move at constant density; each scan's reports are the detections plus uniform clutter, and both
+    # solvers get the same gated problem with the gate as the cost of leaving a track unassigned.
+    rng = np.random.default_rng(seed)
+    gate = chi2.ppf(0.99, 3)
+    sigma = 10.0  # Per-axis prediction and report noise (m)
+    results = []
+    for n in sizes:
+        side = 150.0 * n ** (1.0 / 3.0)
+        targets = rng.uniform(0, side, (n, 3))
+        velocities = rng.normal(0, 20.0, (n, 3))
+        warm_assigner = AuctionAssigner()
+        timings = {'lsa': 0.0, 'auction_cold': 0.0, 'auction_warm': 0.0}
+        gated_pairs = 0
+        max_gap = 0.0
+        for scan in range(scans):
+            targets = targets + velocities
+            predictions = targets + rng.normal(0, sigma, targets.shape)
+            reports = np.vstack([targets + rng.normal(0, sigma, targets.shape),
+                                 rng.uniform(0, side, (int(clutter_ratio * n), 3))])
+            distances = np.sum((reports[np.newaxis] - predictions[:, np.newaxis]) ** 2, axis=-1) / (2 * sigma ** 2)
+            rows, cols = np.nonzero(distances < gate)
+            gated_pairs += rows.size
+            R = reports.shape[0]
+
+            start = perf_counter()
+            cost = np.full((n, R + n), 1e12)
+            cost[rows, cols] = distances[rows, cols]
+            cost[np.arange(n), R + np.arange(n)] = gate
+            row_ind, col_ind = linear_sum_assignment(cost)
+            timings['lsa'] += perf_counter() - start
+            best = cost[row_ind, col_ind].sum()
+
+            for name, assigner, track_ids in (('auction_cold', AuctionAssigner(), None),
+                                              ('auction_warm', warm_assigner, list(range(n)))):
+                start = perf_counter()
+                assignment = assigner.solve(rows, cols, distances[rows, cols], np.full(n, gate), R, track_ids)
+                timings[name] += perf_counter() - start
+                total = np.sum(np.where(assignment >= 0, distances[np.arange(n), np.maximum(assignment, 0)], gate))
+                max_gap = max(max_gap, total - best)
+
+        result = {'tracks': n, 'gated_pairs': gated_pairs // scans, 'max_cost_gap': max_gap}
+        result.update({name: 1000.0 * seconds / scans for name, seconds in timings.items()})
+        results.append(result)
+        print(f"{n:5d} tracks, {result['gated_pairs']:6d} gated pairs: linear_sum_assignment {result['lsa']:8.2f} ms, "
+              f"auction cold {result['auction_cold']:8.2f} ms, warm {result['auction_warm']:8.2f} ms, "
+              f"max cost gap {max_gap:.4f}")
+    return results
+
+
 
 class SystemConfigDialog(QDialog):
     def __init__(self, parent=None):
@@ -797,6 +2709,21 @@ class SystemConfigDialog(QDialog):
         grid.addWidget(self.plant_noise_label, 5, 0)
         grid.addWidget(self.plant_noise_edit, 5, 1)
 
+        # M-of-N track deletion (left empty: tracks only die by timeout)
+        self.deletion_group = QGroupBox("Track Deletion (M misses of last N scans)")
+        deletion_layout = QHBoxLayout()
+        self.miss_m_edit = QLineEdit()
+        self.miss_m_edit.setPlaceholderText("M")
+        deletion_layout.addWidget(self.miss_m_edit)
+        self.miss_n_edit = QLineEdit()
+        self.miss_n_edit.setPlaceholderText("N")
+        deletion_layout.addWidget(self.miss_n_edit)
+        self.scan_period_edit = QLineEdit()
+        self.scan_period_edit.setPlaceholderText("Scan Period (s)")
+        deletion_layout.addWidget(self.scan_period_edit)
+        self.deletion_group.setLayout(deletion_layout)
+        grid.addWidget(self.deletion_group, 6, 0, 1, 2)
+
         # OK and Cancel buttons
         button_box = QHBoxLayout()
         ok_button = QPushButton("OK")
@@ -805,7 +2732,7 @@ class SystemConfigDialog(QDialog):
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
         button_box.addWidget(cancel_button)
-        grid.addLayout(button_box, 6, 0, 1, 2)
+        grid.addLayout(button_box, 7, 0, 1, 2)
 
         self.setLayout(grid)
 
@@ -816,7 +2743,10 @@ class SystemConfigDialog(QDialog):
             "range_gate": (float(self.min_range_edit.text()), float(self.max_range_edit.text())),
             "azimuth_gate": (float(self.min_azimuth_edit.text()), float(self.max_azimuth_edit.text())),
             "elevation_gate": (float(self.min_elevation_edit.text()), float(self.max_elevation_edit.text())),
-            "plant_noise": float(self.plant_noise_edit.text())
+            "plant_noise": float(self.plant_noise_edit.text()),
+            "miss_rule": (int(self.miss_m_edit.text()), int(self.miss_n_edit.text()))
+            if self.miss_m_edit.text() and self.miss_n_edit.text() else None,
+            "scan_period": float(self.scan_period_edit.text()) if self.scan_period_edit.text() else 1.0
         }
 
 
@@ -950,6 +2880,10 @@ class KalmanFilterGUI(QWidget):
         association_layout.addWidget(self.jpda_radio)
         self.munkres_radio = QRadioButton("Munkres")
         association_layout.addWidget(self.munkres_radio)
+        self.auction_radio = QRadioButton("Auction")
+        association_layout.addWidget(self.auction_radio)
+        self.mht_radio = QRadioButton("MHT")
+        association_layout.addWidget(self.mht_radio)
         self.association_group.setLayout(association_layout)
         control_layout.addWidget(self.association_group)
 
@@ -962,9 +2896,51 @@ class KalmanFilterGUI(QWidget):
         filter_layout.addWidget(self.ca_filter_button)
         self.ct_filter_button = QPushButton("CT Filter")
         filter_layout.addWidget(self.ct_filter_button)
+        self.imm_filter_button = QPushButton("IMM Filter")
+        filter_layout.addWidget(self.imm_filter_button)
         self.filter_group.setLayout(filter_layout)
         control_layout.addWidget(self.filter_group)
 
+        # Steady-state gain fast path for converged Firm tracks
+        self.steady_state_checkbox = QCheckBox("Steady-State Gain")
+        control_layout.addWidget(self.steady_state_checkbox)
+
+        # Fixed-lag smoothing (number of scans of latency)
+        self.smoothing_lag_label = QLabel("Fixed-Lag Smoothing")
+        self.smoothing_lag_combo = QComboBox()
+        self.smoothing_lag_combo.addItems(["Off", "2", "3", "5", "10"])
+        control_layout.addWidget(self.smoothing_lag_label)
+        control_layout.addWidget(self.smoothing_lag_combo)
+
+        # Doppler (range-rate) measurement update and 4-D gating
+        self.doppler_checkbox = QCheckBox("Doppler Update")
+        control_layout.addWidget(self.doppler_checkbox)
+
+        # Persistent clutter map (clutter_map.npz) that suppresses repeated false initiations
+        self.clutter_map_checkbox = QCheckBox("Clutter Map")
+        control_layout.addWidget(self.clutter_map_checkbox)
+
+        # Periodic merge of tracks locked onto the same target
+        self.merge_checkbox = QCheckBox("Merge Duplicate Tracks")
+        control_layout.addWidget(self.merge_checkbox)
+
+        # Predict tracks that miss a scan forward instead of leaving them stale
+        self.coasting_checkbox = QCheckBox("Coast Missed Tracks")
+        control_layout.addWidget(self.coasting_checkbox)
+
+        # Split the coverage into azimuth sectors tracked in parallel worker processes
+        self.sector_checkbox = QCheckBox("Sector Processing")
+        control_layout.addWidget(self.sector_checkbox)
+
+        # Read the recording and write the detailed log in threads alongside the tracker
+        self.pipeline_checkbox = QCheckBox("Pipelined I/O")
+        control_layout.addWidget(self.pipeline_checkbox)
+
+        # Float32 filter bank (accuracy is checked against float64 once per input file)
+        self.float32_checkbox = QCheckBox("Float32 Mode")
+        control_layout.addWidget(self.float32_checkbox)
+        self.float32_checked_files = set()
+
         # Plot Type dropdown
         self.plot_type_label = QLabel("Plot Type")
         self.plot_type_combo = QComboBox()
@@ -1091,13 +3067,17 @@ class KalmanFilterGUI(QWidget):
             "range_gate": (0, 1000),
             "azimuth_gate": (0, 360),
             "elevation_gate": (0, 90),
-            "plant_noise": 20  # Default value
+            "plant_noise": 20,  # Default value
+            "miss_rule": None,
+            "scan_period": 1.0
         }
+        self.config_accepted = False  # Limits only reach the tracker once the dialog has been accepted
 
         # Add connections to filter buttons
         self.cv_filter_button.clicked.connect(lambda: self.select_filter("CV"))
         self.ca_filter_button.clicked.connect(lambda: self.select_filter("CA"))
         self.ct_filter_button.clicked.connect(lambda: self.select_filter("CT"))
+        self.imm_filter_button.clicked.connect(lambda: self.select_filter("IMM"))
 
         # Set initial filter mode
         self.filter_mode = "CV"  # Start with CV Filter
@@ -1123,8 +3103,24 @@ class KalmanFilterGUI(QWidget):
     def process_data(self):
         input_file = getattr(self, "input_file", None)
         track_mode = self.track_mode_combo.currentText()
-        association_type = "JPDA" if self.jpda_radio.isChecked() else "Munkres"
+        if self.jpda_radio.isChecked():
+            association_type = "JPDA"
+        elif self.auction_radio.isChecked():
+            association_type = "Auction"
+        elif self.mht_radio.isChecked():
+            association_type = "MHT"
+        else:
+            association_type = "Munkres"
         filter_option = self.filter_mode
+        steady_state_gain = self.steady_state_checkbox.isChecked()
+        lag_text = self.smoothing_lag_combo.currentText()
+        smoothing_lag = 0 if lag_text == "Off" else int(lag_text)
+        use_doppler = self.doppler_checkbox.isChecked()
+        config_data = self.config_data if self.config_accepted else None
+        clutter_map_file = 'clutter_map.npz' if self.clutter_map_checkbox.isChecked() else None
+        merge_interval = 1.0 if self.merge_checkbox.isChecked() else None
+        coasting = self.coasting_checkbox.isChecked()
+        pipeline = self.pipeline_checkbox.isChecked()
 
         if not input_file:
             print("Please select an input file.")
@@ -1134,9 +3130,33 @@ class KalmanFilterGUI(QWidget):
             f"Processing with:\nInput File: {input_file}\nTrack Mode: {track_mode}\nFilter Option: {filter_option}\nAssociation Type: {association_type}"
         )
 
-        self.tracks = main(
-            input_file, track_mode, filter_option, association_type
-        )  # Process data with selected parameters
+        if self.sector_checkbox.isChecked():
+            precision = 'float32' if self.float32_checkbox.isChecked() else 'float64'
+            self.tracks = run_sectors(
+                input_file, track_mode, filter_option, association_type, steady_state_gain=steady_state_gain,
+                precision=precision, smoothing_lag=smoothing_lag, use_doppler=use_doppler, config_data=config_data,
+                clutter_map_file=clutter_map_file, merge_interval=merge_interval, coasting=coasting, pipeline=pipeline
+            )
+        elif self.float32_checkbox.isChecked() and input_file not in self.float32_checked_files:
+            # First float32 run on this recording doubles as the accuracy check against float64
+            self.tracks, _ = check_float32_accuracy(
+                input_file, track_mode, filter_option, association_type, steady_state_gain=steady_state_gain,
+                smoothing_lag=smoothing_lag, use_doppler=use_doppler, config_data=config_data,
+                clutter_map_file=clutter_map_file, merge_interval=merge_interval, coasting=coasting, pipeline=pipeline
+            )
+            self.float32_checked_files.add(input_file)
+        else:
+            precision = 'float32' if self.float32_checkbox.isChecked() else 'float64'
+            self.tracks = main(
+                input_file, track_mode, filter_option, association_type, steady_state_gain=steady_state_gain,
+                precision=precision, smoothing_lag=smoothing_lag, use_doppler=use_doppler, config_data=config_data,
+                clutter_map_file=clutter_map_file, merge_interval=merge_interval, coasting=coasting,
+                pipeline=pipeline
+            )  # Process data with selected parameters
+
+        if self.tracks is not None and not self.sector_checkbox.isChecked():
+            # Offline RTS smoothing of the stored histories for the Track Plot (sector workers smooth their own)
+            rts_smooth_tracks(self.tracks, create_filter(filter_option))
 
         if self.tracks is None:
             print("No tracks were generated.")
@@ -1172,6 +3192,8 @@ class KalmanFilterGUI(QWidget):
         else:
             self.plot_measurements(self.tracks, self.search_plot_widget, plot_type, self.selected_track_ids)
 
+        self.plot_smoothed_tracks(self.tracks, self.track_plot_widget, self.selected_track_ids)
+
     def plot_measurements(self, tracks, plot, plot_type, selected_track_ids=None):
         for track in tracks:
             if selected_track_ids is not None and track['track_id'] not in selected_track_ids:
@@ -1208,6 +3230,27 @@ class KalmanFilterGUI(QWidget):
         plot.setTitle(f'Tracks {plot_type}')
         plot.addLegend()
 
+    def plot_smoothed_tracks(self, tracks, plot_widget, selected_track_ids=None):
+        # Track Plot: filtered vs RTS-smoothed trajectories (x vs y)
+        plot = plot_widget.addPlot()
+        plot.addLegend()
+        for track in tracks:
+            if selected_track_ids is not None and track['track_id'] not in selected_track_ids:
+                continue
+            if 'Ss' not in track or len(track['Sf']) <= 2:
+                continue
+
+            Sf_x = [state[0, 0] for state in track['Sf'][2:]]
+            Sf_y = [state[1, 0] for state in track['Sf'][2:]]
+            Ss_x = [state[0, 0] for state in track['Ss'][2:]]
+            Ss_y = [state[1, 0] for state in track['Ss'][2:]]
+            plot.plot(Sf_x, Sf_y, pen=None, symbol='o', symbolSize=self.marker_size, name=f'Track {track["track_id"]} Sf')
+            plot.plot(Ss_x, Ss_y, pen='g', symbol=None, name=f'Track {track["track_id"]} Smoothed')
+
+        plot.setLabel('left', 'Y Coordinate')
+        plot.setLabel('bottom', 'X Coordinate')
+        plot.setTitle('Smoothed Tracks')
+
     def plot_all_modes(self, tracks, plot):
         # Create a 2x2 grid for subplots within the existing canvas
         self.search_plot_widget.clear()
@@ -1240,8 +3283,8 @@ class KalmanFilterGUI(QWidget):
                 continue
 
             measurements = track["measurements"]
-            x_coords = [sph2cart(*m[0][:3])[0] for m in measurements]
-            y_coords = [sph2cart(*m[0][:3])[1] for m in measurements]
+            x_coords = [measurement_to_cart(m[0])[0] for m in measurements]
+            y_coords = [measurement_to_cart(m[0])[1] for m in measurements]
 
             # PPI plot (x vs y)
             plot.plot(x_coords, y_coords, pen=None, symbol='o', symbolSize=self.marker_size, name=f"Track {track['track_id']} PPI")
@@ -1258,8 +3301,8 @@ class KalmanFilterGUI(QWidget):
                 continue
 
             measurements = track["measurements"]
-            x_coords = [sph2cart(*m[0][:3])[0] for m in measurements]
-            z_coords = [sph2cart(*m[0][:3])[2] for m in measurements]
+            x_coords = [measurement_to_cart(m[0])[0] for m in measurements]
+            z_coords = [measurement_to_cart(m[0])[2] for m in measurements]
 
             # RHI plot (x vs z)
             plot.plot(x_coords, z_coords, pen='--', symbol=None, name=f"Track {track['track_id']} RHI")
@@ -1273,6 +3316,7 @@ class KalmanFilterGUI(QWidget):
         dialog = SystemConfigDialog(self)
         if dialog.exec_():
             self.config_data = dialog.get_config_data()
+            self.config_accepted = True
             print(f"System Configuration Updated: {self.config_data}")
 
     def select_filter(self, filter_type):
@@ -1283,6 +3327,7 @@ class KalmanFilterGUI(QWidget):
         self.cv_filter_button.setChecked(self.filter_mode == "CV")
         self.ca_filter_button.setChecked(self.filter_mode == "CA")
         self.ct_filter_button.setChecked(self.filter_mode == "CT")
+        self.imm_filter_button.setChecked(self.filter_mode == "IMM")
 
     def clear_plot(self):
         self.search_plot_widget.clear()
@@ -1358,6 +3403,9 @@ class NavigationToolbar(NavigationToolbar2QT):
 
 
 if __name__ == "__main__":
+    if '--benchmark-assignment' in sys.argv:
+        benchmark_assignment()
+        sys.exit()
     app = QApplication(sys.argv)
     ex = KalmanFilterGUI()
     ex.show()
@@ -0,0 +1,83 @@
+import csv
+import importlib
+import os
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+SCRIPT = pathlib.Path(__file__).resolve().parents[1] / 'final_working nov19.py'
+
+
+@pytest.fixture(scope='session')
+def tracker(tmp_path_factory):
+    # The script's file name has a space, so it is imported through a link with an importable name;
+    # worker processes started by run_sectors find the link on the inherited sys.path
+    link_dir = tmp_path_factory.mktemp('tracker')
+    (link_dir / 'nov19_tracker.py').symlink_to(SCRIPT)
+    sys.path.insert(0, str(link_dir))
+    return importlib.import_module('nov19_tracker')
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # main() writes detailed_log.csv and track_summary.csv to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def recording_rows(targets, scans, offset=0.2, noise=1.0, seed=0):
+    # Radar rows for targets given as dicts with 'p', 'v' and optional 'a' (m/s^2) and 'w' (turn rate, rad/s).
+    # Target i is reported offset * i seconds into every one-second scan; a target with 'scans' is only
+    # reported on those scans. Columns 10-14 hold range, azimuth, elevation, time and range rate.
+    rng = np.random.default_rng(seed)
+    rows = []
+    states = [dict(p=np.array(t['p'], dtype=float), v=np.array(t['v'], dtype=float)) for t in targets]
+    for k in range(scans):
+        for i, (target, state) in enumerate(zip(targets, states)):
+            if k > 0:
+                w = target.get('w', 0.0)
+                c, s = np.cos(w), np.sin(w)
+                vx, vy = state['v'][0], state['v'][1]
+                state['v'][0], state['v'][1] = c * vx - s * vy, s * vx + c * vy
+                state['v'] = state['v'] + np.array(target.get('a', (0.0, 0.0, 0.0)))
+                state['p'] = state['p'] + state['v']
+            if k not in target.get('scans', range(scans)):
+                continue
+            x, y, z = state['p'] + rng.normal(0, noise, 3)
+            r = np.sqrt(x * x + y * y + z * z)
+            el = np.degrees(np.arctan2(z, np.hypot(x, y)))
+            az = np.degrees(np.arctan2(x, y)) % 360
+            rdot = np.dot(state['p'], state['v']) / np.linalg.norm(state['p'])
+            rows.append([0] * 10 + [r, az, el, k + offset * i, rdot])
+    rows.sort(key=lambda row: row[13])
+    return rows
+
+
+def write_rows(path, rows):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow([f'c{i}' for i in range(15)])
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def make_recording(tmp_path):
+    def make(name, targets, scans=30, **kwargs):
+        return write_rows(tmp_path / name, recording_rows(targets, scans, **kwargs))
+    return make
+
+
+# Three well separated targets, one of them turning
+THREE_TARGETS = [
+    dict(p=(10000.0, 20000.0, 3000.0), v=(15.0, -5.0, 0.0)),
+    dict(p=(-15000.0, 12000.0, 5000.0), v=(-10.0, 12.0, 0.5), w=0.03),
+    dict(p=(5000.0, -25000.0, 2000.0), v=(5.0, 20.0, 0.0)),
+]
+
+
+def firm_tracks(tracks):
+    return [track for track in tracks if track['current_state'] == 'Firm']
@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+from scipy.stats import multivariate_normal
+
+from conftest import THREE_TARGETS
+
+
+def random_covariances(rng, n, m):
+    A = rng.normal(size=(n, m, m))
+    return A @ np.swapaxes(A, -1, -2) + m * np.eye(m)
+
+
+def test_log_likelihoods_match_the_gaussian_density(tracker):
+    rng = np.random.default_rng(0)
+    S = random_covariances(rng, 5, 4)
+    residual = rng.normal(size=(5, 4))
+    distances, log_lik = tracker.innovation_log_likelihoods(residual, S)
+    for k in range(5):
+        assert distances[k] == pytest.approx(residual[k] @ np.linalg.solve(S[k], residual[k]))
+        assert log_lik[k] == pytest.approx(multivariate_normal(np.zeros(4), S[k]).logpdf(residual[k]))
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_indefinite_covariance_does_not_fail_the_scan(tracker, dtype):
+    rng = np.random.default_rng(1)
+    S = random_covariances(rng, 4, 3)
+    S[2] = np.diag([4.0, 1.0, -1e-9])  # Lost definiteness to rounding
+    S[3, 0, 1] += 1e-7  # Slightly asymmetric
+    residual = rng.normal(size=(4, 3))
+    distances, log_lik = tracker.innovation_log_likelihoods(residual.astype(dtype), S.astype(dtype))
+    assert distances.dtype == dtype and log_lik.dtype == dtype
+    assert np.all(np.isfinite(log_lik[[0, 1, 3]]))
+    assert np.all(distances >= 0)
+    reference, _ = tracker.innovation_log_likelihoods(residual[:2], S[:2])
+    np.testing.assert_allclose(distances[:2], reference, rtol=1e-4)
+
+
+def random_assignment_problem(rng, T, R, density=0.3):
+    # Gated (track, report) pairs with costs below a gate of 10; every track may also miss at the gate cost
+    gated = rng.random((T, R)) < density
+    rows, cols = np.nonzero(gated)
+    return rows, cols, rng.uniform(0, 10, rows.size), np.full(T, 10.0)
+
+
+def optimal_cost(rows, cols, costs, miss_costs, R):
+    # The same problem for linear_sum_assignment: report columns, then one miss column per track
+    T = len(miss_costs)
+    matrix = np.full((T, R + T), 1e12)
+    matrix[rows, cols] = costs
+    matrix[np.arange(T), R + np.arange(T)] = miss_costs
+    row_ind, col_ind = linear_sum_assignment(matrix)
+    return matrix[row_ind, col_ind].sum()
+
+
+def assignment_cost(assignment, rows, cols, costs, miss_costs):
+    pair_cost = dict(zip(zip(rows.tolist(), cols.tolist()), costs))
+    assert len(set(a for a in assignment if a >= 0)) == sum(a >= 0 for a in assignment)
+    return sum(pair_cost[(t, a)] if a >= 0 else miss_costs[t] for t, a in enumerate(assignment))
+
+
+@pytest.mark.parametrize('T, R', [(1, 1), (5, 3), (8, 8), (20, 30), (40, 25)])
+def test_auction_is_within_epsilon_of_linear_sum_assignment(tracker, T, R):
+    rng = np.random.default_rng(T * 100 + R)
+    assigner = tracker.AuctionAssigner()
+    for _ in range(5):
+        rows, cols, costs, miss_costs = random_assignment_problem(rng, T, R)
+        assignment = assigner.solve(rows, cols, costs, miss_costs, R)
+        cost = assignment_cost(assignment, rows, cols, costs, miss_costs)
+        assert cost <= optimal_cost(rows, cols, costs, miss_costs, R) + (T + R) * assigner.final_epsilon + 1e-9
+
+
+def test_warm_started_auction_stays_within_epsilon(tracker):
+    # Successive scans of the same tracks with slowly drifting costs reuse the carried prices
+    rng = np.random.default_rng(7)
+    T, R = 15, 15
+    assigner = tracker.AuctionAssigner()
+    rows, cols, costs, miss_costs = random_assignment_problem(rng, T, R, density=0.4)
+    for _ in range(10):
+        costs = np.clip(costs + rng.normal(0, 0.5, costs.size), 0, 9.99)
+        assignment = assigner.solve(rows, cols, costs, miss_costs, R, track_ids=list(range(100, 100 + T)))
+        cost = assignment_cost(assignment, rows, cols, costs, miss_costs)
+        assert cost <= optimal_cost(rows, cols, costs, miss_costs, R) + (T + R) * assigner.final_epsilon + 1e-9
+    assert set(assigner.prices) == set(range(100, 100 + T))
+
+
+def test_auction_tracks_like_munkres(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS, offset=0.01)
+    auction = tracker.main(path, '3-state', 'CV', 'Auction')
+    munkres = tracker.main(path, '3-state', 'CV', 'Munkres')
+    assert len(auction) == len(munkres) == 3
+    for a, b in zip(auction, munkres):
+        assert [m[0][3] for m in a['measurements']] == [m[0][3] for m in b['measurements']]
+        np.testing.assert_allclose(a['Sf'][-1], b['Sf'][-1])
+
+
+def reference_clusters(gated):
+    # Flood fill over the gated pairs, clusters in order of their first track
+    T, R = gated.shape
+    seen_tracks, clusters = set(), []
+    for start in range(T):
+        if start in seen_tracks or not gated[start].any():
+            continue
+        tracks, reports, frontier = {start}, set(), [start]
+        while frontier:
+            new_reports = set(np.flatnonzero(gated[frontier].any(axis=0)).tolist()) - reports
+            reports |= new_reports
+            frontier = sorted(set(np.flatnonzero(gated[:, sorted(new_reports)].any(axis=1)).tolist()) - tracks)
+            tracks |= set(frontier)
+        seen_tracks |= tracks
+        clusters.append((sorted(tracks), sorted(reports)))
+    return clusters
+
+
+@pytest.mark.parametrize('density', [0.0, 0.02, 0.1, 0.5])
+def test_clusters_are_the_connected_components_of_the_gate(tracker, density):
+    gated = np.random.default_rng(3).random((30, 25)) < density
+    assert tracker.group_associations(gated) == reference_clusters(gated)
+
+
+def test_pooled_jpda_matches_serial(tracker):
+    rng = np.random.default_rng(4)
+    T = 120
+    truth = rng.uniform(0, 3000, (T, 3))  # Dense enough for multi-track clusters
+    predictions = truth + rng.normal(0, 5, (T, 3))
+    reports = [tuple(p) for p in truth + rng.normal(0, 5, (T, 3))]
+    prediction_covs = np.tile(np.eye(3) * 25, (T, 1, 1))
+    report_covs = np.tile(np.eye(3) * 25, (T, 1, 1))
+    kalman_filter = tracker.create_filter('CV')
+    serial = tracker.perform_jpda(predictions, prediction_covs, reports, report_covs, kalman_filter)
+    with ThreadPoolExecutor(3) as executor:
+        pooled = tracker.perform_jpda(predictions, prediction_covs, reports, report_covs, kalman_filter,
+                                      executor=executor, parallel_cluster_size=2, gating_rows=16)
+    assert any(len(cluster_tracks) > 1 for cluster_tracks, _ in serial[0])
+    assert pooled[0] == serial[0]
+    assert pooled[1] == serial[1]
+    for a, b in zip(pooled[3], serial[3]):
+        np.testing.assert_allclose(a, b)
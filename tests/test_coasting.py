@@ -0,0 +1,32 @@
+import numpy as np
+
+from conftest import THREE_TARGETS, firm_tracks
+
+
+def test_coasts_are_placed_at_the_missed_scans(tracker, make_recording):
+    # Target 0 is reported at whole seconds and misses scans 15 to 17
+    targets = [dict(THREE_TARGETS[0], scans=[k for k in range(30) if not 15 <= k <= 17])] + THREE_TARGETS[1:]
+    path = make_recording('gap.csv', targets)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', coasting=True)
+    assert len(firm_tracks(tracks)) == 3
+    gap_track = next(track for track in tracks if track['measurements'][0][0][3] == 0.0)
+    assert gap_track['coasted'] == [15.0, 16.0, 17.0]
+    assert all('coasted' not in track for track in tracks if track is not gap_track)
+
+
+def test_every_live_track_with_a_velocity_is_coasted(tracker):
+    def track(state, time, velocity=True):
+        kalman_filter = tracker.create_filter('CV')
+        kalman_filter.initialize_filter_state(1000.0, 2000.0, 300.0, 0, 0, 0, time - 1.0)
+        if velocity:
+            kalman_filter.initialize_filter_state(1010.0, 2000.0, 300.0, 0, 0, 0, time)
+        return {'track_id': 0, 'current_state': state, 'filter': kalman_filter,
+                'measurements': [((0, 0, 0, time), state)]}
+
+    tracks = [track('Firm', 8.0), track('Tentative1', 7.0), track('Poss1', 8.0, velocity=False), track('Firm', 9.5)]
+    missed = tracker.coast_tracks(tracks, 9.0, 10.0, 1.0)
+    assert missed == tracks[:2]
+    assert tracks[0]['coasted'] == [9.0]
+    assert tracks[1]['coasted'] == [8.0]
+    assert tracks[0]['filter'].prev_Time == 9.0
+    np.testing.assert_allclose(tracks[0]['filter'].Sf[:3, 0], [1020.0, 2000.0, 300.0])
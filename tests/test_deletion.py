@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS, firm_tracks, recording_rows, write_rows
+
+# Target 0 stops being reported after scan 14
+VANISHING = [dict(THREE_TARGETS[0], scans=range(15))] + THREE_TARGETS[1:]
+
+CONFIG = {
+    'target_speed': (0, 1000),
+    'target_altitude': (0, 10000),
+    'range_gate': (0, 100000),
+    'azimuth_gate': (0, 360),
+    'elevation_gate': (0, 90),
+    'plant_noise': 20,
+    'miss_rule': None,
+    'scan_period': 1.0,
+}
+
+
+def test_explicit_miss_rule_is_not_overridden_by_config(tracker, make_recording):
+    path = make_recording('vanishing.csv', VANISHING)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', config_data=CONFIG, miss_rule=(2, 3))
+    assert len(tracks) == 2
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', config_data=CONFIG)
+    assert len(tracks) == 3
+
+
+def test_config_miss_rule_applies_when_no_argument_is_given(tracker, make_recording):
+    path = make_recording('vanishing.csv', VANISHING)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', config_data=dict(CONFIG, miss_rule=(2, 3)))
+    assert len(tracks) == 2
+    assert len(firm_tracks(tracks)) == 2
+
+
+def duplicated_rows(tracker, rows, offset=(3.0, 3.0, 0.0)):
+    # Every report again 1 ms later and about 4 m away, as from a split detection
+    duplicates = []
+    for row in rows:
+        x, y, z = np.array(tracker.sph2cart(row[11], row[12], row[10])) + offset
+        r = np.sqrt(x * x + y * y + z * z)
+        duplicates.append([0] * 10 + [r, np.degrees(np.arctan2(x, y)) % 360, np.degrees(np.arctan2(z, np.hypot(x, y))),
+                                      row[13] + 0.001, row[14]])
+    return sorted(rows + duplicates, key=lambda row: row[13])
+
+
+@pytest.mark.parametrize('association_type', ['Munkres', 'JPDA', 'Auction'])
+def test_duplicated_reports_do_not_churn_tracks(tracker, capsys, association_type):
+    path = write_rows('duplicated.csv', duplicated_rows(tracker, recording_rows(THREE_TARGETS, 40)))
+    capsys.readouterr()
+    tracks = tracker.main(path, '3-state', 'CV', association_type, merge_interval=1.0)
+    assert len(firm_tracks(tracks)) == 3
+    assert all(len(track['measurements']) == 40 for track in firm_tracks(tracks))
+    # Only the scans before the targets' tracks went Firm may start tracks on the duplicates
+    assert all(track['measurements'][0][0][3] < 2.0 for track in tracks)
+    assert capsys.readouterr().out.count('due to duplicate') <= 3
+
+
+def test_miss_masks_count_the_misses_of_the_last_n_scans(tracker):
+    tracks = [{'track_id': 7, 'measurements': [((0, 0, 0, 4.0), 'Firm')]},
+              {'track_id': 2, 'measurements': [((0, 0, 0, 5.5), 'Firm')]}]
+    miss_counts = {7: 0b011, 2: 0b111}
+    totals = tracker.update_miss_masks(tracks, miss_counts, 5.0, 3)
+    assert miss_counts == {7: 0b111, 2: 0b110}
+    assert totals.tolist() == [3, 2]
+
+
+def test_miss_state_stays_with_its_track_when_an_earlier_track_is_deleted(tracker, make_recording):
+    # Target 0 vanishes; target 1 misses every third scan, never two of the last three
+    targets = [dict(THREE_TARGETS[0], scans=range(15)),
+               dict(THREE_TARGETS[1], scans=[k for k in range(40) if k % 3 != 2])] + THREE_TARGETS[2:]
+    path = make_recording('intermittent.csv', targets, scans=40)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', miss_rule=(2, 3))
+    assert len(tracks) == 2
+    assert all(track['measurements'][-1][0][3] > 38 for track in tracks)
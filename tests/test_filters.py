@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS, firm_tracks
+
+
+def random_stack(n_tracks, n_states, seed=0):
+    rng = np.random.default_rng(seed)
+    Sf = rng.normal(0, 100, (n_tracks, n_states, 1))
+    A = rng.normal(0, 1, (n_tracks, n_states, n_states))
+    Pf = A @ np.swapaxes(A, -1, -2) + n_states * np.eye(n_states)
+    return Sf, Pf
+
+
+@pytest.mark.parametrize('filter_option', ['CV', 'CA', 'CT'])
+def test_batched_kernels_match_single_track_steps(tracker, filter_option):
+    kernel = tracker.create_filter(filter_option)
+    n = kernel.Sf.shape[0]
+    Sf, Pf = random_stack(5, n)
+    dt = np.array([0.5, 1.0, 1.5, 2.0, 3.0])
+    Z = np.random.default_rng(1).normal(0, 100, (5, 3, 1))
+    Sp, Pp = kernel.predict_batch(Sf, Pf, dt)
+    Sf_batch, Pf_batch, _, _ = kernel.update_batch(Sp, Pp, Z)
+    for i in range(5):
+        single = tracker.create_filter(filter_option)
+        single.Sf, single.Pf, single.prev_Time = Sf[i].copy(), Pf[i].copy(), 10.0
+        single.predict_step(10.0 + dt[i])
+        single.update_step(Z[i])
+        np.testing.assert_allclose(single.Sp, Sp[i], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(single.Sf, Sf_batch[i], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(single.Pf, Pf_batch[i], rtol=1e-9, atol=1e-6)
+
+
+def test_ca_transition_is_exact_for_constant_acceleration(tracker):
+    kernel = tracker.create_filter('CA')
+    state = np.array([1.0, 2.0, 3.0, 10.0, -5.0, 0.0, 0.5, 0.25, -0.1]).reshape(1, 9, 1)
+    Sp, _ = kernel.predict_batch(state, np.eye(9)[np.newaxis], 2.0)
+    expected = state[0, :3, 0] + 2.0 * state[0, 3:6, 0] + 0.5 * 4.0 * state[0, 6:9, 0]
+    np.testing.assert_allclose(Sp[0, :3, 0], expected)
+    np.testing.assert_allclose(Sp[0, 3:6, 0], state[0, 3:6, 0] + 2.0 * state[0, 6:9, 0])
+
+
+def test_ca_tracks_accelerating_target(tracker, make_recording):
+    path = make_recording('accel.csv', [dict(p=(8000.0, 9000.0, 2000.0), v=(10.0, 0.0, 0.0), a=(1.0, 0.5, 0.0))])
+    tracks = tracker.main(path, '3-state', 'CA', 'Munkres')
+    firm = firm_tracks(tracks)
+    assert len(firm) == 1
+    assert len(firm[0]['measurements']) == 30
+    # Velocity estimate follows the accelerating target (true vx = 10 + 29 at the last scan)
+    assert abs(firm[0]['Sf'][-1][3, 0] - 39.0) < 5.0
+
+
+def test_three_target_recording_gives_three_firm_tracks(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS)
+    for filter_option in ('CV', 'CA', 'CT', 'IMM'):
+        tracks = tracker.main(path, '3-state', filter_option, 'Munkres')
+        assert len(firm_tracks(tracks)) == 3, filter_option
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS, firm_tracks
+
+# Two targets 3 km apart in x whose paths cross at scan 20, 60 m apart in altitude
+CROSSING = [
+    dict(p=(8000.0, 20000.0, 3000.0), v=(15.0, 10.0, 0.0)),
+    dict(p=(8000.0, 20400.0, 3060.0), v=(15.0, -10.0, 0.0)),
+]
+
+
+def test_mht_tracks_separated_targets_like_munkres(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS, offset=0.01)
+    mht = tracker.main(path, '3-state', 'CV', 'MHT')
+    munkres = tracker.main(path, '3-state', 'CV', 'Munkres')
+    assert len(firm_tracks(mht)) == 3
+    for a, b in zip(mht, munkres):
+        np.testing.assert_allclose(a['Sf'][-1], b['Sf'][-1], atol=1e-6)
+
+
+@pytest.mark.parametrize('n_scan, max_hypotheses', [(1, 1), (3, 10), (5, 4)])
+def test_trees_respect_the_hypothesis_budget_and_depth(tracker, make_recording, n_scan, max_hypotheses):
+    path = make_recording('crossing.csv', CROSSING, scans=40, offset=0.01)
+    tracks = tracker.main(path, '3-state', 'CV', 'MHT', n_scan=n_scan, max_hypotheses=max_hypotheses)
+    assert len(firm_tracks(tracks)) == 2
+    for track in firm_tracks(tracks):
+        assert 1 <= len(track['mht_leaves']) <= max_hypotheses
+        assert all(len(leaf['history']) <= n_scan for leaf in track['mht_leaves'])
+
+
+def test_crossing_targets_keep_their_identities(tracker, make_recording):
+    path = make_recording('crossing.csv', CROSSING, scans=40, offset=0.01)
+    tracks = firm_tracks(tracker.main(path, '3-state', 'CV', 'MHT'))
+    assert len(tracks) == 2
+    for track in tracks:
+        # The altitude separates the targets throughout, so each track ends on the target it started on
+        altitudes = [sf[2, 0] for sf in track['Sf']]
+        assert abs(altitudes[-1] - altitudes[0]) < 20.0
+
+
+def test_associate_prefers_the_target_over_clutter(tracker):
+    kalman_filter = tracker.create_filter('CV')
+    kalman_filter.initialize_filter_state(1000.0, 2000.0, 300.0, 0, 0, 0, 0.0)
+    kalman_filter.initialize_filter_state(1010.0, 2000.0, 300.0, 0, 0, 0, 1.0)
+    kalman_filter.prev_Time = kalman_filter.Meas_Time = 1.0
+    tracks = [{'track_id': 0, 'current_state': 'Firm', 'filter': kalman_filter, 'measurements': []}]
+    reports = [(1025.0, 2005.0, 300.0), (1020.5, 2000.2, 300.1)]
+    predictions, prediction_covs = tracker.predict_track_measurements(tracks, 2.0, kalman_filter)
+    report_covs = kalman_filter.measurement_covariances([tracker.cart2sph(*r) for r in reports])
+    mht = tracker.MultipleHypothesisTracker()
+    best = mht.associate(tracks, reports, predictions, prediction_covs, report_covs, kalman_filter, 2.0)
+    assert best == [(0, reports[1])]
+    assert kalman_filter.prev_Time == 2.0
+    assert len(tracks[0]['mht_leaves']) == 3  # Both reports and the miss
@@ -0,0 +1,85 @@
+import copy
+
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS, firm_tracks, recording_rows, write_rows
+
+
+def position(time):
+    return np.array([[1000.0 + 10 * time], [2000.0 + 5 * time], [300.0]])
+
+
+def run_filter(tracker, filter_option, times, seed=0):
+    rng = np.random.default_rng(seed)
+    kalman_filter = tracker.create_filter(filter_option)
+    for time in times[:2]:
+        kalman_filter.initialize_filter_state(*position(time)[:, 0], 0, 0, 0, time)
+    for time in times[2:]:
+        kalman_filter.process_measurement(position(time) + rng.normal(0, 1, (3, 1)), time)
+    return kalman_filter
+
+
+@pytest.mark.parametrize('filter_option', ['CV', 'IMM'])
+def test_late_report_is_gated_against_the_buffered_state(tracker, filter_option):
+    kalman_filter = run_filter(tracker, filter_option, np.arange(8.0))
+    Sp, Pp = kalman_filter.peek_prediction(5.5)
+
+    # Replay rewinds to the state before the update at time 6 and predicts forward from there
+    rewound = copy.deepcopy(kalman_filter)
+    entry = next(entry for entry in rewound.oosm_buffer if entry[0] > 5.5)
+    rewound.restore(entry[3])
+    rewound.predict_step(5.5)
+    np.testing.assert_allclose(Sp, rewound.Sp)
+    np.testing.assert_allclose(Pp, rewound.Pp)
+    assert kalman_filter.innovation_distance(position(5.5), 5.5) < kalman_filter.gate_threshold
+
+
+@pytest.mark.parametrize('filter_option', ['CV', 'IMM'])
+def test_late_report_replay_matches_in_order_processing(tracker, filter_option):
+    times = [0.0, 1.0, 2.0, 3.0, 4.0, 4.5, 5.0, 6.0, 7.0]
+    in_order = run_filter(tracker, filter_option, times)
+
+    rng = np.random.default_rng(0)
+    late = tracker.create_filter(filter_option)
+    for time in times[:2]:
+        late.initialize_filter_state(*position(time)[:, 0], 0, 0, 0, time)
+    noise = {time: rng.normal(0, 1, (3, 1)) for time in times[2:]}
+    for time in [t for t in times[2:] if t != 4.5] + [4.5]:
+        in_sequence = late.process_measurement(position(time) + noise[time], time)
+    assert not in_sequence
+    np.testing.assert_allclose(late.Sf, in_order.Sf, atol=1e-9)
+    np.testing.assert_allclose(late.Pf, in_order.Pf, atol=1e-9)
+
+
+def test_report_older_than_the_buffer_is_not_predicted_backwards(tracker):
+    kalman_filter = run_filter(tracker, 'CV', np.arange(20.0))
+    Sp, Pp = kalman_filter.peek_prediction(2.0)
+    np.testing.assert_allclose(Sp, kalman_filter.Sf)
+    np.testing.assert_allclose(Pp, kalman_filter.Pf)
+
+
+def test_snapshots_are_never_predicted_backwards(tracker):
+    kalman_filter = run_filter(tracker, 'CA', np.arange(8.0))
+    _, Sp, Pp = kalman_filter.predict_snapshots([kalman_filter.snapshot()], 3.0)
+    np.testing.assert_allclose(Sp[0], kalman_filter.Sf)
+    np.testing.assert_allclose(Pp[0], kalman_filter.Pf)
+
+
+@pytest.mark.parametrize('use_doppler', [False, True])
+@pytest.mark.parametrize('rows_at, delay', [((15.0,), 6.5), ((15.0,), 12.5), ((15.0, 15.2, 15.4), 6.5)])
+def test_late_group_does_not_start_a_spurious_track(tracker, use_doppler, rows_at, delay):
+    rows = recording_rows(THREE_TARGETS, 30)
+    late = [row for row in rows if row[13] in rows_at]
+    rows = [row for row in rows if row[13] not in rows_at]
+    at = max(i for i, row in enumerate(rows) if row[13] < min(rows_at) + delay) + 1
+    path = write_rows('delayed.csv', rows[:at] + late + rows[at:])
+
+    tracks = tracker.main(path, '3-state', 'CV', 'JPDA', use_doppler=use_doppler)
+    assert len(tracks) == 3
+    assert len(firm_tracks(tracks)) == 3
+    for track in tracks:
+        times = [m[0][3] for m in track['measurements']]
+        assert times == sorted(times)
+        assert len(track['Sf']) == len(times)
+    tracker.rts_smooth_tracks(tracks, tracker.create_filter('CV'))
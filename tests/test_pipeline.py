@@ -0,0 +1,44 @@
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS, recording_rows, write_rows
+
+
+def test_pipeline_matches_sequential_run(tracker, make_recording, capsys):
+    path = make_recording('three.csv', THREE_TARGETS, offset=0.01)
+    sequential = tracker.main(path, '3-state', 'CV', 'JPDA', log_file_path='sequential_log.csv')
+    capsys.readouterr()
+    pipelined = tracker.main(path, '3-state', 'CV', 'JPDA', pipeline=True, queue_size=4, log_file_path='pipeline_log.csv')
+    assert 'Converted spherical to Cartesian' not in capsys.readouterr().out  # The reader thread streams silently
+    assert len(sequential) == len(pipelined) == 3
+    for a, b in zip(sequential, pipelined):
+        assert [m for m, _ in a['measurements']] == [m for m, _ in b['measurements']]
+        np.testing.assert_array_equal(np.array(a['Sf']), np.array(b['Sf']))
+    with open('sequential_log.csv') as a, open('pipeline_log.csv') as b:
+        assert a.read() == b.read()
+
+
+def test_pipeline_stages_are_joined_when_the_reader_fails(tracker):
+    rows = recording_rows(THREE_TARGETS, 20)
+    rows[30][10] = 'corrupt'
+    path = write_rows('corrupt.csv', rows)
+    with pytest.raises(ValueError):
+        tracker.main(path, '3-state', 'CV', 'Munkres', pipeline=True, queue_size=2)
+    assert not [thread for thread in threading.enumerate() if thread.name in ('reader', 'writer')]
+
+
+def test_console_writes_from_other_threads_reach_the_widget_on_the_gui_thread(tracker):
+    app = tracker.QApplication.instance() or tracker.QApplication([])
+    console = tracker.QTextEdit()
+    stream = tracker.OutputStream(console)
+    appended_on = []
+    stream.text_written.connect(lambda text: appended_on.append(threading.current_thread()))
+    thread = threading.Thread(target=stream.write, args=('from the reader',))
+    thread.start()
+    thread.join()
+    assert console.toPlainText() == ''  # Queued until the GUI thread runs its event loop
+    app.processEvents()
+    assert console.toPlainText() == 'from the reader'
+    assert appended_on == [threading.main_thread()]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from conftest import THREE_TARGETS
+
+SIGMAS = (1.0, 0.003, 0.003)  # Range (m), azimuth and elevation (rad)
+
+
+@pytest.mark.parametrize('filter_option', ['CV', 'CA', 'IMM'])
+def test_float32_covariances_stay_positive_semi_definite(tracker, make_recording, filter_option):
+    path = make_recording('three.csv', THREE_TARGETS, scans=40)
+    tracks = tracker.main(path, '3-state', filter_option, 'JPDA', precision='float32',
+                          measurement_sigmas=SIGMAS, use_doppler=True)
+    assert tracks
+    for track in tracks:
+        assert all(sf.dtype == np.float32 for sf in track['Sf'])
+        assert all(pf.dtype == np.float32 for pf in track['Pf'])
+        Pf = np.array(track['Pf'], dtype=np.float64)
+        np.testing.assert_allclose(Pf, np.swapaxes(Pf, -1, -2), rtol=1e-6, atol=1e-6)
+        eigenvalues = np.linalg.eigvalsh(Pf)
+        assert np.all(eigenvalues[:, 0] >= -1e-6 * eigenvalues[:, -1])
+
+
+def test_float32_accuracy_check_passes_on_reference_recording(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS, scans=40)
+    tracks, divergence = tracker.check_float32_accuracy(path, '3-state', 'CA', 'JPDA',
+                                                        measurement_sigmas=SIGMAS, use_doppler=True)
+    assert len(tracks) == 3
+    assert divergence < 1.0
@@ -0,0 +1,35 @@
+import numpy as np
+
+from conftest import THREE_TARGETS
+
+# Flies east through north at 5 km, from sector 3 into sector 0 of four
+SEAM_TARGET = dict(p=(-1000.0, 5000.0, 1000.0), v=(50.0, 0.0, 0.0))
+
+
+def test_sectors_match_a_single_process_when_targets_stay_in_one_sector(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS)
+    sectors = tracker.run_sectors(path, '3-state', 'CV', 'Munkres', n_sectors=4, workers=2)
+    single = tracker.main(path, '3-state', 'CV', 'Munkres')
+    tracker.rts_smooth_tracks(single, tracker.create_filter('CV'))
+    assert len(sectors) == len(single) == 3
+    single = sorted(single, key=lambda track: track['measurements'][0][0][3])
+    sectors = sorted(sectors, key=lambda track: track['measurements'][0][0][3])
+    for a, b in zip(sectors, single):
+        assert len(a['sectors']) == 1
+        np.testing.assert_allclose(np.array(a['Sf']), np.array(b['Sf']))
+        np.testing.assert_allclose(np.array(a['Ss']), np.array(b['Ss']))
+
+
+def test_target_crossing_a_seam_is_stitched_deterministically(tracker, make_recording):
+    path = make_recording('seam.csv', [SEAM_TARGET], scans=40)
+    first = tracker.run_sectors(path, '3-state', 'CV', 'Munkres', n_sectors=4, overlap=5.0, workers=2, smoothing_lag=3)
+    second = tracker.run_sectors(path, '3-state', 'CV', 'Munkres', n_sectors=4, overlap=5.0, workers=2, smoothing_lag=3)
+    assert len(first) == 1
+    track = first[0]
+    assert track['sectors'] == [0, 3]
+    times = [m[0][3] for m in track['measurements']]
+    assert times == sorted(times) and len(times) == 40
+    assert len(track['Ss']) == len(track['Ps']) == 40
+    for a, b in zip(first, second):
+        assert a['sectors'] == b['sectors']
+        np.testing.assert_array_equal(np.array(a['Ss']), np.array(b['Ss']))
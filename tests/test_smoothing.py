@@ -0,0 +1,90 @@
+import numpy as np
+
+from conftest import firm_tracks
+
+TARGET = dict(p=(10000.0, 20000.0, 3000.0), v=(15.0, -5.0, 0.0))
+
+
+def truth(time):
+    return np.array(TARGET['p']) + np.array(TARGET['v']) * time
+
+
+def firm_errors(track, key):
+    # Position errors of the Firm steps of a single track against the straight-line truth
+    steps = [k for k, (_, state) in enumerate(track['measurements']) if state == 'Firm']
+    return np.array([np.linalg.norm(track[key][k][:3, 0] - truth(track['measurements'][k][0][3])) for k in steps])
+
+
+def naive_rts(Sf, Pf, Sp, Pp, Phi):
+    # Textbook single-track RTS with explicit inverses, as the reference for the batched pass
+    Ss, Ps = list(Sf), list(Pf)
+    for k in range(len(Sf) - 2, -1, -1):
+        A = Pf[k] @ Phi[k].T @ np.linalg.inv(Pp[k + 1])
+        Ss[k] = Sf[k] + A @ (Ss[k + 1] - Sp[k + 1])
+        Ps[k] = Pf[k] + A @ (Ps[k + 1] - Pp[k + 1]) @ A.T
+    return np.array(Ss), np.array(Ps)
+
+
+def test_backward_pass_matches_single_track_reference(tracker):
+    rng = np.random.default_rng(1)
+    T, N, n = 6, 3, 6
+    kalman_filter = tracker.create_filter('CV')
+    Sf = rng.normal(size=(T, N, n, 1))
+    Sp = rng.normal(size=(T, N, n, 1))
+    A = rng.normal(size=(2, T, N, n, n))
+    Pf = A[0] @ np.swapaxes(A[0], -1, -2) + n * np.eye(n)
+    Pp = A[1] @ np.swapaxes(A[1], -1, -2) + 2 * n * np.eye(n)
+    Phi = np.array([kalman_filter.transition_matrices(np.full(N, 1.0 + 0.1 * k), Sf[k])[0] for k in range(T)])
+    mask = np.ones((T, N), dtype=bool)
+    mask[4:, 2] = False  # Track 2 is two steps shorter
+
+    Ss, Ps = tracker.rts_backward_pass(Sf, Pf, Sp, Pp, Phi, mask)
+    for j, L in enumerate((T, T, 4)):
+        ref_Ss, ref_Ps = naive_rts(Sf[:L, j], Pf[:L, j], Sp[:L, j], Pp[:L, j], Phi[:L, j])
+        np.testing.assert_allclose(Ss[:L, j], ref_Ss, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(Ps[:L, j], ref_Ps, rtol=1e-9, atol=1e-9)
+        np.testing.assert_array_equal(Ss[L:, j], Sf[L:, j])
+
+
+def test_rts_smoothing_reduces_error_and_covariance(tracker, make_recording):
+    path = make_recording('single.csv', [TARGET], scans=40, noise=5.0)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres')
+    assert len(firm_tracks(tracks)) == 1
+    tracker.rts_smooth_tracks(tracks, tracker.create_filter('CV'))
+    track = firm_tracks(tracks)[0]
+    assert len(track['Ss']) == len(track['Sf'])
+    np.testing.assert_allclose(track['Ss'][-1], track['Sf'][-1])
+    filtered, smoothed = firm_errors(track, 'Sf'), firm_errors(track, 'Ss')
+    assert np.sqrt(np.mean(smoothed ** 2)) < np.sqrt(np.mean(filtered ** 2))
+    for Pf, Ps in zip(track['Pf'], track['Ps']):
+        assert np.trace(Ps[:3, :3]) <= np.trace(Pf[:3, :3]) * (1 + 1e-9)
+
+
+def test_fixed_lag_matches_full_smoother_over_the_last_window(tracker, make_recording):
+    # RTS smoothing of step k only uses steps k..end, so the last fixed-lag estimate, lag steps
+    # from the end, must equal the full smoother at that step
+    lag = 3
+    path = make_recording('single.csv', [TARGET], scans=40, noise=5.0)
+    tracks = tracker.main(path, '3-state', 'CV', 'Munkres', smoothing_lag=lag)
+    track = firm_tracks(tracks)[0]
+    firm_steps = [k for k, (_, state) in enumerate(track['measurements']) if state == 'Firm']
+    assert len(track['fixed_lag']) == len(firm_steps) - lag
+    assert len(track['lag_buffer']) == lag + 1
+
+    tracker.rts_smooth_tracks(tracks, tracker.create_filter('CV'))
+    time, Ss, Ps = track['fixed_lag'][-1]
+    k = len(track['Sf']) - 1 - lag
+    assert time == track['measurements'][k][0][3]
+    np.testing.assert_allclose(Ss, track['Ss'][k], rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(Ps, track['Ps'][k], rtol=1e-9, atol=1e-9)
+
+
+def test_fixed_lag_reduces_error(tracker, make_recording):
+    path = make_recording('single.csv', [TARGET], scans=40, noise=5.0)
+    track = firm_tracks(tracker.main(path, '3-state', 'CV', 'Munkres', smoothing_lag=5))[0]
+    lagged = np.array([np.linalg.norm(Ss[:3, 0] - truth(time)) for time, Ss, _ in track['fixed_lag']])
+    times = [time for time, _, _ in track['fixed_lag']]
+    filtered = np.array([np.linalg.norm(sf[:3, 0] - truth(m[0][3]))
+                         for sf, m in zip(track['Sf'], track['measurements']) if m[0][3] in times])
+    assert len(filtered) == len(lagged)
+    assert np.sqrt(np.mean(lagged ** 2)) < np.sqrt(np.mean(filtered ** 2))
@@ -0,0 +1,42 @@
+import numpy as np
+
+from conftest import THREE_TARGETS
+
+
+def run_filter(tracker, steady_state_gain, times, seed=0):
+    rng = np.random.default_rng(seed)
+    kalman_filter = tracker.create_filter('CV', steady_state_gain)
+    kalman_filter.initialize_filter_state(1000.0, 2000.0, 300.0, 0, 0, 0, times[0])
+    kalman_filter.initialize_filter_state(1010.0, 2005.0, 300.0, 0, 0, 0, times[1])
+    for k, time in enumerate(times[2:], start=2):
+        Z = np.array([[1000.0 + 10 * k], [2000.0 + 5 * k], [300.0]]) + rng.normal(0, 1, (3, 1))
+        kalman_filter.process_measurement(Z, time)
+    return kalman_filter
+
+
+def test_gain_is_cached_after_convergence_and_matches_full_update(tracker):
+    times = np.arange(40.0)
+    cached = run_filter(tracker, True, times)
+    full = run_filter(tracker, False, times)
+    assert cached.converged
+    assert 1.0 in cached.steady_state_cache
+    assert cached.use_cached_gain
+    np.testing.assert_allclose(cached.Sf, full.Sf, atol=1e-3)
+    np.testing.assert_allclose(cached.Pf, full.Pf, rtol=1e-3)
+
+
+def test_revisit_interval_change_leaves_steady_state(tracker):
+    times = list(np.arange(40.0)) + [41.0]  # One scan missed
+    kalman_filter = run_filter(tracker, True, times)
+    assert not kalman_filter.use_cached_gain
+    assert not kalman_filter.converged
+
+
+def test_main_with_steady_state_gain_matches_full_updates(tracker, make_recording):
+    path = make_recording('three.csv', THREE_TARGETS, scans=40)
+    full = tracker.main(path, '3-state', 'CV', 'Munkres')
+    cached = tracker.main(path, '3-state', 'CV', 'Munkres', steady_state_gain=True)
+    assert len(full) == len(cached)
+    for a, b in zip(full, cached):
+        assert len(a['Sf']) == len(b['Sf'])
+        np.testing.assert_allclose(np.array(a['Sf']), np.array(b['Sf']), atol=0.05)